@@ -1,74 +1,292 @@
+import time
+
+BOOT_STARTED = time.perf_counter()
+
 import os
+import json
+import hashlib
+import pkgutil
 import discord
 import asyncio
 from discord.ext import commands
 
+from utils.giphy import FALLBACK_PATH as GIPHY_FALLBACK_PATH, GiphyClient
+from utils.metrics import (
+    METRICS_PORT, InstrumentedTree, MetricsServer, monitor_loop_lag, record_command
+)
+
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-#DEV_GUILD_ID = 729007907131359322  # <-- your server ID
-DEV_GUILD_ID = 942018727174619186 
+
+# dev: commands synced to DEV_GUILD_ID only (instant); prod: synced globally
+DEV_GUILD_ID = int(os.getenv("DEV_GUILD_ID", "0")) or None
+BOT_ENV = os.getenv("BOT_ENV", "dev" if DEV_GUILD_ID else "prod").lower()
+
+# Hash of the last synced command tree per scope; sync only when it changes
+COMMAND_HASH_PATH = os.getenv("ZEE_COMMAND_HASH", "data/command_tree.json")
+FORCE_SYNC = os.getenv("ZEE_FORCE_SYNC", "0") == "1"
+
+# Guilds that still have guild-only copies of the commands from an old dev
+# sync (comma-separated IDs). In prod each is cleared once, or its members
+# would see every command twice next to the global ones.
+LEGACY_GUILD_IDS = [
+    int(part) for part in os.getenv("LEGACY_GUILD_IDS", "").split(",") if part.strip()
+]
+
+# Benchmarking: log in, report time-to-ready, then shut down
+EXIT_ON_READY = os.getenv("ZEE_EXIT_ON_READY", "0") == "1"
+
+if BOT_ENV not in ("dev", "prod"):
+    raise RuntimeError(f"BOT_ENV must be 'dev' or 'prod', not {BOT_ENV!r}")
+
+if BOT_ENV == "dev" and not DEV_GUILD_ID:
+    raise RuntimeError("BOT_ENV=dev needs DEV_GUILD_ID in .env")
+
+def parse_shard_ids(text):
+    """Parse "0-3,6" into [0, 1, 2, 3, 6]."""
+    ids = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+# Sharding: ZEE_SHARDED=1 runs every shard in this process with
+# AutoShardedBot. To spread load over several workers, give each one the
+# same SHARD_COUNT and its own SHARD_IDS range (e.g. "0-3" and "4-7").
+# Workers share one Ollama: ASK_CONCURRENCY/ASK_QUEUE_SIZE are split between
+# them (at least one generation each) and only the worker with shard 0 keeps
+# the model warm. Each worker has its own GIF pools, seeded from its saved file.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS", "")) or None
+SHARDED = os.getenv("ZEE_SHARDED", "0") == "1" or SHARD_COUNT is not None
+
+if SHARD_IDS and not SHARD_COUNT:
+    raise RuntimeError("SHARD_IDS needs SHARD_COUNT")
+
+if SHARD_IDS and max(SHARD_IDS) >= SHARD_COUNT:
+    raise RuntimeError(f"SHARD_IDS {SHARD_IDS} out of range for SHARD_COUNT={SHARD_COUNT}")
+
+# Fraction of the bot's shards this process runs; budgets shared by every
+# worker (the Giphy key's hourly quota, /ask concurrency) are split by it
+WORKER_SHARE = len(SHARD_IDS) / SHARD_COUNT if SHARD_IDS else 1.0
+
+# Comma-separated extension list; default is every module in cogs/
+EXTENSIONS = [ext.strip() for ext in os.getenv("ZEE_EXTENSIONS", "").split(",") if ext.strip()]
+
 intents = discord.Intents.default()
 intents.message_content = True
 
 
-class MyBot(commands.Bot):
+BotBase = commands.AutoShardedBot if SHARDED else commands.Bot
+
+
+class MyBot(BotBase):
     def __init__(self):
+        shard_options = {}
+        if SHARDED:
+            shard_options = {"shard_count": SHARD_COUNT, "shard_ids": SHARD_IDS}
+
         super().__init__(
             command_prefix="!",
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=InstrumentedTree,
+            **shard_options
         )
+        self.worker_share = WORKER_SHARE
+
+        # Shared Giphy client; its pooled session is opened on first request.
+        # Each worker keeps its own fallback/budget file.
+        giphy_state = GIPHY_FALLBACK_PATH
+        if SHARD_IDS:
+            root, ext = os.path.splitext(GIPHY_FALLBACK_PATH)
+            giphy_state = f"{root}.shards-{SHARD_IDS[0]}-{SHARD_IDS[-1]}{ext}"
+        self.giphy = GiphyClient(share=WORKER_SHARE, fallback_path=giphy_state)
+        self.ready_seconds = None
+
+        # Each sharded worker gets its own port: METRICS_PORT + first shard id
+        port = METRICS_PORT + (SHARD_IDS[0] if SHARD_IDS else 0)
+        self.metrics_server = MetricsServer(port=port) if METRICS_PORT else None
+        self._lag_task = None
+
+    @property
+    def is_primary(self):
+        """Whether this process does once-per-bot work such as command sync."""
+        return not SHARDED or SHARD_IDS is None or 0 in SHARD_IDS
+
+    def owns_guild(self, guild_id):
+        """Whether ``guild_id`` is served by one of this process's shards.
+
+        Per-guild state (reminders, live boards) is only loaded by its owner.
+        """
+        if not SHARDED or SHARD_IDS is None:
+            return True
+        return (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
 
     async def setup_hook(self):
         print("⚡ setup_hook CALLED")
-
-        # Load cogs
-        await self.load_extension("cogs.greet")
-        print("✅ greet loaded")
-
-        await self.load_extension("cogs.gifz")
-        print("✅ gifz loaded")
-
-        await self.load_extension("cogs.events")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.slap")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.hug")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.yeet")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.pat")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.ask_zee")
-        print("✅ events loaded")
-
-        await self.load_extension("cogs.shard")
-        print("✅ events loaded")
-
-        guild = discord.Object(id=DEV_GUILD_ID)
-
-        # DEV MODE: instant commands
-        print("🧹 Clearing guild commands")
-        self.tree.clear_commands(guild=guild)
-
-        print("📋 Copying global commands to guild")
-        self.tree.copy_global_to(guild=guild)
-
-        print("🔄 Syncing guild commands")
+        if SHARDED:
+            print(f"🧩 Sharded mode: shards {SHARD_IDS or 'auto'} of {SHARD_COUNT or 'auto'}")
+
+        self._lag_task = asyncio.create_task(monitor_loop_lag())
+        if self.metrics_server is not None:
+            try:
+                await self.metrics_server.start()
+            except OSError as e:
+                print("⚠️ Metrics endpoint unavailable:", e)
+                self.metrics_server = None
+
+        await self.load_extensions()
+
+        if self.is_primary:
+            await self.sync_commands()
+
+    def discover_extensions(self):
+        if EXTENSIONS:
+            return EXTENSIONS
+
+        cogs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cogs")
+        return sorted(f"cogs.{mod.name}" for mod in pkgutil.iter_modules([cogs_dir]))
+
+    async def load_extensions(self):
+        """Load every extension concurrently; one failing cog doesn't stop the rest."""
+        timings = {}
+
+        async def load(name):
+            start = time.perf_counter()
+            try:
+                await self.load_extension(name)
+                ok = True
+            except Exception as e:
+                print(f"❌ {name} failed to load: {e}")
+                ok = False
+            timings[name] = (time.perf_counter() - start, ok)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(load(name) for name in self.discover_extensions()))
+        total = time.perf_counter() - start
+
+        print("📦 Extension load times:")
+        for name, (elapsed, ok) in sorted(timings.items(), key=lambda item: -item[1][0]):
+            print(f" {'✅' if ok else '❌'} {name:<20} {elapsed * 1000:8.1f} ms")
+        print(f" ⏱️ {len(timings)} extensions in {total * 1000:.1f} ms")
+
+    def command_tree_hash(self, guild=None):
+        cmds = self.tree.get_commands(guild=guild)
+        try:
+            payload = [cmd.to_dict(self.tree) for cmd in cmds]
+        except TypeError:
+            # discord.py < 2.4: to_dict() takes no tree
+            payload = [cmd.to_dict() for cmd in cmds]
+
+        payload.sort(key=lambda cmd: (cmd.get("type", 1), cmd["name"]))
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def sync_commands(self):
+        if BOT_ENV == "dev":
+            # DEV MODE: instant commands in one guild
+            guild = discord.Object(id=DEV_GUILD_ID)
+            scope = f"{self.application_id}:guild:{DEV_GUILD_ID}"
+
+            self.tree.clear_commands(guild=guild)
+            self.tree.copy_global_to(guild=guild)
+        else:
+            guild = None
+            scope = f"{self.application_id}:global"
+
+        digest = self.command_tree_hash(guild)
+
+        try:
+            with open(COMMAND_HASH_PATH, encoding="utf-8") as f:
+                hashes = json.load(f)
+        except (OSError, ValueError):
+            hashes = {}
+
+        if BOT_ENV == "prod":
+            if await self.clear_legacy_guilds(hashes):
+                self.save_command_hashes(hashes)
+
+        if hashes.get(scope) == digest and not FORCE_SYNC:
+            print(f"⏭️ Command tree unchanged ({scope}), skipping sync")
+            return
+
+        print(f"🔄 Syncing commands ({scope})")
         synced = await self.tree.sync(guild=guild)
 
         print("📌 Synced commands:")
         for cmd in synced:
             print(" -", cmd.name)
 
+        hashes[scope] = digest
+        self.save_command_hashes(hashes)
+
+    async def clear_legacy_guilds(self, hashes):
+        """Remove the old guild-only copies of our commands, once per guild."""
+        cleared = False
+        for guild_id in LEGACY_GUILD_IDS:
+            scope = f"{self.application_id}:guild:{guild_id}"
+            if hashes.get(scope) == "cleared":
+                continue
+
+            guild = discord.Object(id=guild_id)
+            self.tree.clear_commands(guild=guild)
+            try:
+                await self.tree.sync(guild=guild)
+            except discord.HTTPException as e:
+                # e.g. Forbidden: no longer in that guild; nothing to clean up
+                print(f"⚠️ Couldn't clear guild commands in {guild_id}:", e)
+                if not isinstance(e, discord.Forbidden):
+                    continue
+
+            print(f"🧹 Cleared guild commands in {guild_id}")
+            hashes[scope] = "cleared"
+            cleared = True
+
+        return cleared
+
+    @staticmethod
+    def save_command_hashes(hashes):
+        directory = os.path.dirname(COMMAND_HASH_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(COMMAND_HASH_PATH, "w", encoding="utf-8") as f:
+            json.dump(hashes, f, indent=2)
+
+    async def on_app_command_completion(self, interaction, command):
+        record_command(interaction, command.qualified_name)
+
+    async def on_shard_ready(self, shard_id):
+        print(f"🧩 Shard {shard_id} ready")
+
     async def on_ready(self):
         print(f"✅ Logged in as {self.user}")
 
+        # on_ready fires again after reconnects; only the first one counts
+        if self.ready_seconds is None:
+            self.ready_seconds = time.perf_counter() - BOOT_STARTED
+            print(f"⏱️ Ready in {self.ready_seconds:.2f}s")
+
+            if EXIT_ON_READY:
+                await self.close()
+
+    async def close(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+
+        # Unloads the cogs first, so no GIF pool can refill after the session closes
+        await super().close()
+        await self.giphy.close()
+
 
 bot = MyBot()
 
@@ -91,7 +309,9 @@ async def hello(ctx):
 
 
 async def main():
-    await bot.start(DISCORD_TOKEN)
+    async with bot:
+        await bot.start(DISCORD_TOKEN)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,15 @@
+import os
+import time
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
-import requests
 
-OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
+from utils.ollama import OllamaClient, OllamaTimeout
+from utils.inference_queue import InferenceScheduler, QueueFull, UserQueueFull
+from utils.answer_cache import AnswerCache
+from utils.conversation import ConversationStore
+
 MODEL = "huihui_ai/deepseek-r1-abliterated:7b"
 
 SYSTEM_PROMPT = (
@@ -12,49 +18,334 @@ SYSTEM_PROMPT = (
     "You speak like a human, not like an AI."
 )
 
+# Stream tokens into the reply as they are generated (ZEE_STREAM=0 to disable)
+STREAM_REPLIES = os.getenv("ZEE_STREAM", "1") != "0"
+
+# DeepSeek-R1 reasons inside <think>…</think> before answering. Fast mode asks
+# Ollama to skip reasoning and caps the generation length.
+FAST_MODE_DEFAULT = os.getenv("ZEE_FAST", "0") == "1"
+FAST_OPTIONS = {
+    "num_predict": int(os.getenv("ZEE_FAST_NUM_PREDICT", "512")),
+    "stop": ["\nUser:"]
+}
+
+# Keep the model resident so /ask never pays Ollama's load time
+KEEP_ALIVE = os.getenv("ZEE_KEEP_ALIVE", "30m")
+WARM_CHECK_SECONDS = int(os.getenv("ZEE_WARM_CHECK", "300"))
+
+# A local 7B model only serves one or two generations at a time. These are
+# totals for the bot: sharded workers (SHARD_IDS) split them by their share
+# of the shards, but each worker runs at least one generation, so N workers
+# can still reach N at once (see AI.__init__)
+ASK_CONCURRENCY = int(os.getenv("ASK_CONCURRENCY", "1"))
+ASK_QUEUE_SIZE = int(os.getenv("ASK_QUEUE_SIZE", "8"))
+ASK_MAX_PER_USER = int(os.getenv("ASK_MAX_PER_USER", "2"))
+
+# Discord allows roughly 5 message edits per 5 seconds per channel
+EDIT_INTERVAL = 1.2
+MESSAGE_LIMIT = 2000
+CURSOR = " ▌"
+
+
+def split_message(text, limit=MESSAGE_LIMIT):
+    """Split ``text`` into the first chunk that fits in a message and the rest.
+
+    Prefers breaking at a newline, then at a space, before cutting hard.
+    """
+    if len(text) <= limit:
+        return text, ""
+
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        cut = text.rfind(" ", 0, limit)
+    if cut < limit // 2:
+        cut = limit
+
+    return text[:cut].rstrip(), text[cut:].lstrip()
+
+
+class ThinkFilter:
+    """Drops <think>…</think> sections from a token stream.
+
+    Tags may be split across chunks, so a possible partial tag at the end of
+    a chunk is held back until the next one arrives.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self):
+        self.inside = False
+        self.pending = ""
+        self.started = False
+
+    def feed(self, chunk):
+        buf = self.pending + chunk
+        out = []
+
+        while buf:
+            tag = self.CLOSE if self.inside else self.OPEN
+            idx = buf.find(tag)
+
+            if idx >= 0:
+                if not self.inside:
+                    out.append(buf[:idx])
+                buf = buf[idx + len(tag):]
+                self.inside = not self.inside
+                continue
+
+            # Hold back a suffix that could be the start of the tag
+            keep = 0
+            for n in range(min(len(tag) - 1, len(buf)), 0, -1):
+                if tag.startswith(buf[-n:]):
+                    keep = n
+                    break
+
+            if not self.inside:
+                out.append(buf[:len(buf) - keep])
+            buf = buf[len(buf) - keep:] if keep else ""
+            break
+
+        self.pending = buf
+        return self._visible("".join(out))
+
+    def flush(self):
+        # An unterminated <think> is dropped; a dangling partial tag is text
+        rest = "" if self.inside else self.pending
+        self.pending = ""
+        return self._visible(rest)
+
+    def _visible(self, text):
+        # Skip the blank lines the model leaves after </think>
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        return text
+
+
+def strip_think(text):
+    think = ThinkFilter()
+    return (think.feed(text) + think.flush()).strip()
+
+
+class StreamingReply:
+    """Incrementally edits the deferred followup as tokens arrive.
+
+    Edits are throttled to ``EDIT_INTERVAL`` and text past the 2000 character
+    limit continues in a new followup message instead of being cut off.
+    """
+
+    def __init__(self, interaction: discord.Interaction, message=None):
+        self.interaction = interaction
+        # An existing followup (e.g. the queue notice) is reused for the reply
+        self.message = message
+        self.text = ""       # not yet finalised (current message)
+        self.full_text = ""  # everything received
+        self.shown = message.content if message is not None else ""
+        self.last_edit = 0.0
+
+    async def feed(self, token):
+        self.text += token
+        self.full_text += token
+
+        if time.monotonic() - self.last_edit >= EDIT_INTERVAL and self.text.strip():
+            await self.flush(CURSOR)
+
+    async def finish(self):
+        await self.flush()
+
+    async def flush(self, suffix=""):
+        # Finalise full messages and continue the overflow in a new one
+        while len(self.text) + len(suffix) > MESSAGE_LIMIT:
+            head, self.text = split_message(self.text, MESSAGE_LIMIT - len(CURSOR))
+            await self._show(head)
+            self.message = None
+            self.shown = ""
+
+        await self._show(self.text + suffix)
+        self.last_edit = time.monotonic()
+
+    async def _show(self, content):
+        if not content.strip() or content == self.shown:
+            return
+
+        if self.message is None:
+            self.message = await self.interaction.followup.send(content, wait=True)
+        else:
+            await self.message.edit(content=content)
+
+        self.shown = content
+
+
+class QueueNotice:
+    """The "you're #N in line" followup, edited as the queue moves."""
+
+    def __init__(self, interaction: discord.Interaction):
+        self.interaction = interaction
+        self.message = None
+        self.closed = False
+        self._lock = asyncio.Lock()
+
+    async def update(self, position):
+        async with self._lock:
+            if self.closed:
+                return
+
+            content = f"⏳ Zee is busy — you're **#{position}** in line…"
+            try:
+                if self.message is None:
+                    self.message = await self.interaction.followup.send(content, wait=True)
+                else:
+                    await self.message.edit(content=content)
+            except discord.HTTPException as e:
+                print("Queue notice error:", e)
+
+    async def close(self):
+        # Waits for an in-flight edit so it can't land on top of the answer
+        async with self._lock:
+            self.closed = True
+            return self.message
+
+
 class AI(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.ollama = OllamaClient()
+
+        share = bot.worker_share
+        concurrency = max(1, int(ASK_CONCURRENCY * share))
+        if share < 1 and concurrency > ASK_CONCURRENCY * share:
+            print(
+                f"⚠️ /ask runs {concurrency} generation(s) per worker; with "
+                f"{round(1 / share)} workers Ollama may see more than ASK_CONCURRENCY={ASK_CONCURRENCY}"
+            )
+        self.scheduler = InferenceScheduler(
+            concurrency=concurrency,
+            max_queue=max(1, int(ASK_QUEUE_SIZE * share)),
+            max_per_user=ASK_MAX_PER_USER
+        )
+        self.answers = AnswerCache()
+        self.memory = ConversationStore()
+
+        # "cold" → "warming" → "warm"; see keep_warm()
+        self.model_state = "cold"
+        self._warm_task = None
+
+    async def cog_load(self):
+        # Nothing here should delay the gateway connection; the Ollama session
+        # is created on first use and the rest waits until the bot is ready
+        self._warm_task = asyncio.create_task(self.after_ready())
+
+    async def after_ready(self):
+        await self.bot.wait_until_ready()
+        await self.answers.open()
+
+        # One Ollama serves every worker; only the primary keeps it warm
+        if self.bot.is_primary:
+            await self.keep_warm()
+        else:
+            self.model_state = "kept warm by the primary worker"
+
+    async def cog_unload(self):
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+
+        # Cancels any generation still running
+        await self.ollama.close()
+        await self.answers.close()
+
+    async def keep_warm(self):
+        """Preload MODEL, then periodically re-check and ping it with keep_alive."""
+        while True:
+            try:
+                loaded = await self.ollama.loaded_models()
+
+                if MODEL not in loaded:
+                    if self.model_state == "warm":
+                        print(f"🧊 {MODEL} was unloaded")
+                    self.model_state = "warming"
+                    print(f"🔥 Preloading {MODEL}")
+
+                await self.ollama.preload(MODEL, KEEP_ALIVE)
+
+                if self.model_state != "warm":
+                    print(f"✅ {MODEL} is warm")
+                self.model_state = "warm"
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.model_state = "cold"
+                print("Ollama warm-up error:", e)
+
+            await asyncio.sleep(WARM_CHECK_SECONDS)
 
     @app_commands.command(
         name="ask",
         description="Ask Zee anything ✨"
     )
+    @app_commands.describe(fast="Skip Zee's long reasoning for a quicker, shorter answer")
     async def ask(
         self,
         interaction: discord.Interaction,
-        question: str
+        question: str,
+        fast: bool = FAST_MODE_DEFAULT
     ):
         # Prevent 'interaction failed'
         await interaction.response.defer(thinking=True)
 
+        key = (interaction.channel_id, interaction.user.id)
+        # Follow-ups depend on the conversation, so only fresh questions are
+        # cached; fast replies are shorter and may be cut off, so they never are
+        cacheable = not fast and not self.memory.has_history(key)
+
         try:
+            # Repeated questions are answered from the cache at no GPU cost
+            if cacheable:
+                cached = await self.answers.get(question, MODEL, SYSTEM_PROMPT)
+                if cached:
+                    await self.send_long(interaction, cached)
+                    self.memory.record(key, question, cached)
+                    return
+
+            prompt, context = self.memory.build_prompt(key, SYSTEM_PROMPT, question)
             payload = {
                 "model": MODEL,
-                "prompt": f"{SYSTEM_PROMPT}\n\nUser: {question}\nZee:",
-                "stream": False
+                "prompt": prompt,
+                "keep_alive": KEEP_ALIVE
             }
+            if context:
+                payload["context"] = context
+            if fast:
+                payload["think"] = False
+                payload["options"] = FAST_OPTIONS
 
-            response = requests.post(
-                OLLAMA_URL,
-                json=payload,
-                timeout=300  # DeepSeek can be slow
-            )
-            response.raise_for_status()
+            notice = QueueNotice(interaction)
+            async with self.scheduler.slot(interaction.user.id, notice.update):
+                message = await notice.close()
 
-            data = response.json()
-            reply = data.get("response", "").strip()
+                if STREAM_REPLIES:
+                    reply, context = await self.ask_streaming(interaction, payload, message)
+                else:
+                    reply, context = await self.ask_blocking(interaction, payload, message)
 
-            if not reply:
-                reply = "🤔 I didn’t get a clear response. Try again?"
+            if reply:
+                self.memory.record(key, question, reply, context)
+                if cacheable:
+                    await self.answers.put(question, MODEL, SYSTEM_PROMPT, reply)
 
-            # Discord hard limit
-            if len(reply) > 2000:
-                reply = reply[:1990] + "..."
+        except UserQueueFull:
+            await interaction.followup.send(
+                "🚦 You already have questions waiting — let Zee finish those first."
+            )
 
-            await interaction.followup.send(reply)
+        except QueueFull:
+            await interaction.followup.send(
+                "🚦 Zee is answering too many questions right now. Try again in a minute."
+            )
 
-        except requests.exceptions.Timeout:
+        except OllamaTimeout:
             await interaction.followup.send(
                 "⏳ I’m still thinking… that model is a bit heavy. Try again in a moment."
             )
@@ -65,5 +356,62 @@ class AI(commands.Cog):
                 "⚠️ Zee couldn’t reach her brain right now. Is Ollama running?"
             )
 
+    async def ask_blocking(self, interaction, payload, message=None):
+        # Runs on the event loop without blocking it; DeepSeek can be slow
+        data = await self.ollama.generate(payload)
+        reply = strip_think(data.get("response", ""))
+
+        if not reply:
+            await self.send_long(interaction, "🤔 I didn’t get a clear response. Try again?", message)
+            return "", None
+
+        await self.send_long(interaction, reply, message)
+        return reply, data.get("context")
+
+    async def ask_streaming(self, interaction, payload, message=None):
+        reply = StreamingReply(interaction, message)
+        think = ThinkFilter()
+        context = None
+
+        async for chunk in self.ollama.stream(payload):
+            token = think.feed(chunk.get("response", ""))
+            if token:
+                await reply.feed(token)
+
+            if chunk.get("done"):
+                context = chunk.get("context")
+
+        tail = think.flush()
+        if tail:
+            await reply.feed(tail)
+
+        text = reply.full_text.strip()
+        if not text:
+            reply.text = "🤔 I didn’t get a clear response. Try again?"
+
+        await reply.finish()
+        return text, context
+
+    @app_commands.command(
+        name="forget",
+        description="Make Zee forget your conversation in this channel"
+    )
+    async def forget(self, interaction: discord.Interaction):
+        if self.memory.forget((interaction.channel_id, interaction.user.id)):
+            await interaction.response.send_message("🧹 Done — fresh start!", ephemeral=True)
+        else:
+            await interaction.response.send_message("🤷 We weren’t talking about anything.", ephemeral=True)
+
+    async def send_long(self, interaction, text, message=None):
+        # Discord hard limit: continue in extra messages instead of truncating
+        while text:
+            chunk, text = split_message(text)
+            if message is not None:
+                await message.edit(content=chunk)
+                message = None
+            else:
+                await interaction.followup.send(chunk)
+
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(AI(bot))
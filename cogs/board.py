@@ -0,0 +1,181 @@
+import json
+import asyncio
+import hashlib
+import discord
+from discord.ext import commands
+from discord import app_commands
+from datetime import datetime
+
+from utils.boards import BoardStore
+
+# How often the board loop checks for changed content
+BOARD_TICK_SECONDS = 30
+# Gap between consecutive board edits, spreading them across guilds
+EDIT_SPACING_SECONDS = 0.5
+
+
+class Board(commands.GroupCog, name="board"):
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.store = BoardStore()
+
+        # guild_id -> [channel_id, message_id, digest of last content shown]
+        self.boards = {}
+        self._task = None
+
+        self.edits = 0
+
+    async def cog_load(self):
+        self._task = asyncio.create_task(self.board_loop())
+
+    async def cog_unload(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.store.close()
+
+    # =========================================
+    # RENDERING
+    # =========================================
+    def render(self):
+        """Current board embeds (from the events/shard caches) and their digest."""
+        embeds = []
+
+        events = self.bot.get_cog("Events")
+        if events is not None:
+            embeds.append(events.build_embed())
+
+        shard = self.bot.get_cog("shard")
+        if shard is not None:
+            data = shard.build_shard(datetime.now(shard.la))
+            if data:
+                embeds.append(shard.embed_for(data, "Today's Shard"))
+
+        payload = json.dumps([e.to_dict() for e in embeds], sort_keys=True)
+        return embeds, hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    # =========================================
+    # UPDATE LOOP
+    # =========================================
+    async def board_loop(self):
+        await self.bot.wait_until_ready()
+        await self.store.open()
+
+        for guild_id, channel_id, message_id in await self.store.load():
+            # In sharded mode each process only updates its own guilds' boards
+            if self.bot.owns_guild(guild_id):
+                self.boards[guild_id] = [channel_id, message_id, None]
+
+        while True:
+            try:
+                await self.update_boards()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Board update error:", e)
+
+            await asyncio.sleep(BOARD_TICK_SECONDS)
+
+    async def update_boards(self):
+        embeds, digest = self.render()
+        if not embeds:
+            return
+
+        for guild_id, board in list(self.boards.items()):
+            channel_id, message_id, shown = board
+
+            # Edit only when the content actually changed
+            if shown == digest:
+                continue
+
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue  # not cached here (yet)
+
+            try:
+                await channel.get_partial_message(message_id).edit(content=None, embeds=embeds)
+                board[2] = digest
+                self.edits += 1
+            except discord.NotFound:
+                print(f"🗑️ Board message in guild {guild_id} is gone, dropping it")
+                self.boards.pop(guild_id, None)
+                await self.store.remove(guild_id)
+            except discord.HTTPException as e:
+                print(f"Board edit in guild {guild_id} failed:", e)
+
+            await asyncio.sleep(EDIT_SPACING_SECONDS)
+
+    # =========================================
+    # COMMANDS
+    # =========================================
+    @app_commands.command(name="set", description="Post a live events & shard board that updates itself")
+    @app_commands.describe(channel="Where to post the board (defaults to this channel)")
+    @app_commands.default_permissions(manage_channels=True)
+    @app_commands.guild_only()
+    async def set(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel = None
+    ):
+        channel = channel or interaction.channel
+        embeds, digest = self.render()
+
+        if not embeds:
+            await interaction.response.send_message(
+                "⚠️ There's nothing to put on the board — the events and shard modules aren't loaded.",
+                ephemeral=True
+            )
+            return
+
+        # Posting, pinning and removing the old board can outlast the
+        # 3-second response window
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            message = await channel.send(embeds=embeds)
+        except discord.HTTPException:
+            await interaction.followup.send(
+                f"❌ I can't post in {channel.mention}.",
+                ephemeral=True
+            )
+            return
+
+        # Best-effort: needs Manage Messages, and a channel holds at most 50 pins
+        pinned = True
+        try:
+            await message.pin(reason="Zee live board")
+        except discord.HTTPException:
+            pinned = False
+
+        old = self.boards.get(interaction.guild_id)
+        self.boards[interaction.guild_id] = [channel.id, message.id, digest]
+        await self.store.set(interaction.guild_id, channel.id, message.id)
+
+        if old is not None:
+            old_channel = self.bot.get_channel(old[0])
+            if old_channel is not None:
+                try:
+                    await old_channel.get_partial_message(old[1]).delete()
+                except discord.HTTPException:
+                    pass
+
+        note = "" if pinned else " (couldn't pin it — give me **Manage Messages** to pin)"
+        await interaction.followup.send(
+            f"📌 Live board posted in {channel.mention}.{note}",
+            ephemeral=True
+        )
+
+    @app_commands.command(name="remove", description="Stop updating this server's live board")
+    @app_commands.default_permissions(manage_channels=True)
+    @app_commands.guild_only()
+    async def remove(self, interaction: discord.Interaction):
+        if self.boards.pop(interaction.guild_id, None) is None:
+            await interaction.response.send_message("🤷 This server has no live board.", ephemeral=True)
+            return
+
+        await self.store.remove(interaction.guild_id)
+        await interaction.response.send_message("🗑️ Live board stopped.", ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Board(bot))
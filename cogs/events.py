@@ -1,31 +1,83 @@
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta, timezone
 
+from utils.embed_cache import EmbedCache
+
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# name -> (minute, interval hours, hour offset) for the repeating wax events
+INTERVAL_EVENTS = {
+    "turtle": (20, 2, 0),
+    "grandma": (5, 2, 0),
+    "geyser": (35, 2, 1),
+}
+
+# At most one Refresh edit per message in this window
+REFRESH_DEBOUNCE = 5.0
+
 
 class EventsView(discord.ui.View):
+    # Persistent: registered with bot.add_view so buttons survive restarts
     def __init__(self, cog):
         super().__init__(timeout=None)
         self.cog = cog
 
-    @discord.ui.button(label="🔄 Refresh", style=discord.ButtonStyle.primary)
+    @discord.ui.button(
+        label="🔄 Refresh",
+        style=discord.ButtonStyle.primary,
+        custom_id="zee:events:refresh"
+    )
     async def refresh(self, interaction: discord.Interaction, button: discord.ui.Button):
         embed = self.cog.build_embed()
+
+        if not self.cog.claim_refresh(interaction.message.id, embed):
+            # Click storm or nothing changed: acknowledge without editing
+            await interaction.response.defer()
+            return
+
         await interaction.response.edit_message(embed=embed, view=self)
 
 
 class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.embeds = EmbedCache()
+        self.view = EventsView(self)
+
+        # message id -> (monotonic time of last edit, embed shown)
+        self._refreshed = {}
+
+    async def cog_load(self):
+        self.bot.add_view(self.view)
+
+    async def cog_unload(self):
+        self.view.stop()
+
+    def claim_refresh(self, message_id, embed):
+        """Whether a Refresh click on ``message_id`` should edit the message."""
+        now = time.monotonic()
+        last = self._refreshed.get(message_id)
+
+        if last is not None and (last[1] is embed or now - last[0] < REFRESH_DEBOUNCE):
+            return False
+
+        if len(self._refreshed) > 1000:
+            self._refreshed = {
+                mid: entry for mid, entry in self._refreshed.items()
+                if now - entry[0] < REFRESH_DEBOUNCE
+            }
+
+        self._refreshed[message_id] = (now, embed)
+        return True
 
     def now_ist(self):
         return datetime.now(IST)
 
-    def next_interval_event(self, minute, interval, hour_offset=0):
-        now = self.now_ist()
+    def next_interval_event(self, minute, interval, hour_offset=0, now=None):
+        now = self.now_ist() if now is None else now.astimezone(IST)
         base = now.replace(hour=hour_offset, minute=minute, second=0, microsecond=0)
 
         while base <= now:
@@ -33,17 +85,34 @@ class Events(commands.Cog):
 
         return base
 
-    def build_embed(self):
-        now = self.now_ist()
-
-        turtle = self.next_interval_event(minute=20, interval=2, hour_offset=0)
-        grandma = self.next_interval_event(minute=5, interval=2, hour_offset=0)
-        geyser = self.next_interval_event(minute=35, interval=2, hour_offset=1)
-
+    def next_reset(self, now=None):
+        now = self.now_ist() if now is None else now.astimezone(IST)
         reset = now.replace(hour=13, minute=30, second=0, microsecond=0)
         if reset <= now:
             reset += timedelta(days=1)
 
+        return reset
+
+    def next_event(self, name, now=None):
+        """Next start of ``name`` ("turtle", "grandma", "geyser" or "reset") after ``now``."""
+        if name == "reset":
+            return self.next_reset(now)
+
+        minute, interval, hour_offset = INTERVAL_EVENTS[name]
+        return self.next_interval_event(minute, interval, hour_offset, now)
+
+    def build_embed(self):
+        # Same embed for everyone until the soonest event starts
+        return self.embeds.get_or_render("events", self.render_embed)
+
+    def render_embed(self):
+        now = self.now_ist()
+
+        turtle = self.next_event("turtle", now)
+        grandma = self.next_event("grandma", now)
+        geyser = self.next_event("geyser", now)
+        reset = self.next_reset(now)
+
         events = [
             ("Turtle 🐢", turtle),
             ("Grandma 🍥", grandma),
@@ -59,21 +128,20 @@ class Events(commands.Cog):
             color=discord.Color.blue()
         )
 
-        for name, time in events:
-            unix = int(time.timestamp())
+        for name, when in events:
+            unix = int(when.timestamp())
             embed.add_field(
                 name=name,
                 value=f"🕒 Next: <t:{unix}:F>\n⏳ Starts: <t:{unix}:R>",
                 inline=False
             )
 
-        return embed
+        return embed, events[0][1].timestamp()
 
     @app_commands.command(name="events", description="Shows upcoming wax event times")
     async def events(self, interaction: discord.Interaction):
         embed = self.build_embed()
-        view = EventsView(self)
-        await interaction.response.send_message(embed=embed, view=view)
+        await interaction.response.send_message(embed=embed, view=self.view)
 
 
 async def setup(bot):
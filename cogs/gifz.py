@@ -1,16 +1,9 @@
-import os
-import aiohttp
 import random
 import discord
 from discord.ext import commands
 from discord import app_commands
 
-
-GIPHY_API_KEY = os.getenv("GIPHY_API_KEY")
-GIPHY_URL = "https://api.giphy.com/v1/gifs/search"
-
-if not GIPHY_API_KEY:
-    raise RuntimeError("GIPHY_API_KEY not found in .env file")
+from utils.giphy import GIPHY_API_KEY, GiphyError
 
 
 class Gifz(commands.Cog):
@@ -27,33 +20,23 @@ class Gifz(commands.Cog):
         interaction: discord.Interaction,
         query: str
     ):
-        params = {
-            "api_key": GIPHY_API_KEY,
-            "q": query,
-            "limit": 10,
-            "rating": "pg-13"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(GIPHY_URL, params=params) as resp:
-                if resp.status != 200:
-                    await interaction.response.send_message(
-                        "❌ Failed to contact Giphy.",
-                        ephemeral=True
-                    )
-                    return
-
-                data = await resp.json()
+        try:
+            gifs = await self.bot.giphy.search(query, rating="pg-13", limit=10)
+        except GiphyError:
+            await interaction.response.send_message(
+                "❌ Failed to contact Giphy.",
+                ephemeral=True
+            )
+            return
 
-        if not data["data"]:
+        if not gifs:
             await interaction.response.send_message(
                 f"No GIFs found for **{query}** 😔",
                 ephemeral=True
             )
             return
 
-        gif = random.choice(data["data"])
-        gif_url = gif["images"]["original"]["url"]
+        gif_url = random.choice(gifs)
 
         embed = discord.Embed(
             title=f"GIF result for: {query}",
@@ -65,4 +48,7 @@ class Gifz(commands.Cog):
 
 
 async def setup(bot):
+    if not GIPHY_API_KEY:
+        raise RuntimeError("GIPHY_API_KEY not found in .env file")
+
     await bot.add_cog(Gifz(bot))
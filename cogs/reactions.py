@@ -0,0 +1,103 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from dataclasses import dataclass
+
+from utils.giphy import GIPHY_API_KEY, GiphyError
+from utils.gif_pool import GifPool
+
+
+@dataclass(frozen=True)
+class Action:
+    name: str          # slash command name
+    query: str         # Giphy search the pool is filled from
+    verb: str          # "{sender} {verb} {target}!"
+    rating: str = ""
+    description: str = ""
+
+
+# Adding a reaction is one row here: no new module, session or task code
+ACTIONS = (
+    Action("hug", "Anime hug", "hugged"),
+    Action("pat", "Anime Head Pat", "gave head pat"),
+    Action("slap", "Anime Slap", "slapped", rating="pg-13", description="Slap someone (anime style)"),
+    Action("yeet", "Throwing a person", "yeeted"),
+)
+
+
+class Reactions(commands.Cog):
+    """Anime reaction GIF commands, one per row of ``ACTIONS``.
+
+    Every action has its own GIF pool, but all of them fetch through the
+    bot's shared Giphy client (one connection pool and search cache).
+    """
+
+    def __init__(self, bot, actions=ACTIONS):
+        self.bot = bot
+        self.actions = {action.name: action for action in actions}
+        self.pools = {
+            action.name: GifPool(bot.giphy, action.query, rating=action.rating)
+            for action in actions
+        }
+        self.commands = [self.make_command(action) for action in actions]
+
+    async def cog_load(self):
+        for command in self.commands:
+            self.bot.tree.add_command(command)
+
+        # Fill the pools in the background once the gateway is up
+        for pool in self.pools.values():
+            pool.start(wait_for=self.bot.wait_until_ready)
+
+    async def cog_unload(self):
+        for command in self.commands:
+            self.bot.tree.remove_command(command.name)
+
+        for pool in self.pools.values():
+            pool.stop()
+
+    def make_command(self, action):
+        async def callback(interaction: discord.Interaction, user: discord.Member):
+            await self.react(interaction, action, user)
+
+        command = app_commands.Command(
+            name=action.name,
+            description=action.description or f"{action.name} someone (anime style)",
+            callback=callback
+        )
+        return app_commands.describe(user=f"Who do you want to {action.name}?")(command)
+
+    async def react(self, interaction: discord.Interaction, action, user: discord.Member):
+        sender = interaction.user.display_name
+        target = user.display_name
+
+        try:
+            gif_url = await self.pools[action.name].pick()
+        except GiphyError:
+            await interaction.response.send_message(
+                f"❌ Couldn't fetch a {action.name} GIF 😔",
+                ephemeral=True
+            )
+            return
+
+        if not gif_url:
+            await interaction.response.send_message(
+                f"❌ No {action.name} GIFs found!",
+                ephemeral=True
+            )
+            return
+
+        embed = discord.Embed(
+            description=f"💥 **{sender} {action.verb} {target}!**",
+            color=discord.Color.red()
+        )
+        embed.set_image(url=gif_url)
+
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    if not GIPHY_API_KEY:
+        raise RuntimeError("GIPHY_API_KEY missing from .env")
+
+    await bot.add_cog(Reactions(bot))
@@ -0,0 +1,233 @@
+import asyncio
+import discord
+from discord.ext import commands
+from discord import app_commands
+from datetime import datetime, timezone
+
+from utils.reminders import ReminderEngine, ReminderStore
+
+# target -> label; shard targets are "<color>:<occurrence>" (0 = any occurrence)
+TARGETS = {
+    "turtle": "Turtle 🐢",
+    "grandma": "Grandma 🍥",
+    "geyser": "Geyser 🏝️",
+    "reset": "Daily Reset 🔄️",
+    "shard:0": "Shard (any occurrence)",
+    "red:0": "🔴 Red Shard (any occurrence)",
+    "red:1": "🔴 Red Shard occurrence 1",
+    "red:2": "🔴 Red Shard occurrence 2",
+    "red:3": "🔴 Red Shard occurrence 3",
+    "black:0": "⚫ Black Shard (any occurrence)",
+    "black:1": "⚫ Black Shard occurrence 1",
+    "black:2": "⚫ Black Shard occurrence 2",
+    "black:3": "⚫ Black Shard occurrence 3",
+}
+
+TARGET_CHOICES = [app_commands.Choice(name=label, value=target) for target, label in TARGETS.items()]
+
+MESSAGE_LIMIT = 2000
+
+
+class Remind(commands.GroupCog, name="remind"):
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.store = ReminderStore()
+        self.engine = ReminderEngine(self.resolve, self.deliver)
+        self._start_task = None
+
+    async def cog_load(self):
+        # Events/shard cogs may still be loading; start once the bot is ready
+        self._start_task = asyncio.create_task(self.start_engine())
+
+    async def start_engine(self):
+        await self.bot.wait_until_ready()
+        await self.store.open()
+
+        for guild_id, channel_id, user_id, target, lead in await self.store.load():
+            # In sharded mode each process only fires its own guilds' reminders
+            if target in TARGETS and self.bot.owns_guild(guild_id):
+                self.engine.add(channel_id, user_id, target, lead)
+
+        self.engine.start()
+        print(f"⏰ {len(self.engine)} reminders scheduled")
+
+    async def cog_unload(self):
+        if self._start_task is not None:
+            self._start_task.cancel()
+        self.engine.stop()
+        await self.store.close()
+
+    # =========================================
+    # ENGINE CALLBACKS
+    # =========================================
+    def resolve(self, target, after_ts):
+        after = datetime.fromtimestamp(after_ts, timezone.utc)
+        kind, _, occurrence = target.partition(":")
+
+        if not occurrence:
+            events = self.bot.get_cog("Events")
+            return events.next_event(kind, after).timestamp() if events else None
+
+        shard = self.bot.get_cog("shard")
+        if shard is None:
+            return None
+
+        color = None if kind == "shard" else kind
+        return shard.next_occurrence(after, color, int(occurrence))
+
+    async def deliver(self, channel_id, items):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            # Not cached (e.g. an archived thread): ask Discord before giving up
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except (discord.NotFound, discord.Forbidden):
+                await self.drop_channel(channel_id)
+                return
+
+        lines = []
+        mentions = set()
+        for target, event_ts, users in sorted(items, key=lambda item: item[1]):
+            lines.append(f"⏰ **{TARGETS[target]}** starts <t:{int(event_ts)}:R>")
+            mentions.update(user for user in users if user)
+
+        content = "\n".join(lines)
+        pings = [f"<@{user}>" for user in sorted(mentions)]
+
+        # One message per channel, spilling over only for very long ping lists
+        messages = []
+        current = content
+        for ping in pings:
+            if len(current) + len(ping) + 1 > MESSAGE_LIMIT:
+                messages.append(current)
+                current = ping
+            else:
+                current += ("\n" if current is content else " ") + ping
+        messages.append(current)
+
+        allowed = discord.AllowedMentions(everyone=False, roles=False, users=True)
+        try:
+            for text in messages:
+                await channel.send(text, allowed_mentions=allowed)
+        except (discord.NotFound, discord.Forbidden) as e:
+            # Deleted, or we lost access: stop retrying it at every event
+            print(f"⏰ Dropping reminders for channel {channel_id}:", e)
+            await self.drop_channel(channel_id)
+
+    async def drop_channel(self, channel_id):
+        self.engine.remove_channel(channel_id)
+        await self.store.remove_channel(channel_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        await self.drop_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_thread_delete(self, thread):
+        await self.drop_channel(thread.id)
+
+    # =========================================
+    # COMMANDS
+    # =========================================
+    def subscriber(self, interaction, channel_wide):
+        return 0 if channel_wide else interaction.user.id
+
+    def can_manage(self, interaction):
+        perms = getattr(interaction.user, "guild_permissions", None)
+        return perms is not None and perms.manage_channels
+
+    @app_commands.command(name="add", description="Get reminded before an event or shard")
+    @app_commands.describe(
+        event="What to be reminded about",
+        minutes="How many minutes before it starts",
+        channel_wide="Remind the whole channel instead of just you (needs Manage Channels)"
+    )
+    @app_commands.choices(event=TARGET_CHOICES)
+    async def add(
+        self,
+        interaction: discord.Interaction,
+        event: app_commands.Choice[str],
+        minutes: app_commands.Range[int, 0, 180] = 5,
+        channel_wide: bool = False
+    ):
+        if interaction.guild_id is None:
+            await interaction.response.send_message("❌ Reminders only work in servers.", ephemeral=True)
+            return
+
+        if channel_wide and not self.can_manage(interaction):
+            await interaction.response.send_message(
+                "❌ You need **Manage Channels** for channel-wide reminders.",
+                ephemeral=True
+            )
+            return
+
+        user_id = self.subscriber(interaction, channel_wide)
+        if not self.engine.add(interaction.channel_id, user_id, event.value, minutes):
+            await interaction.response.send_message("ℹ️ That reminder is already set.", ephemeral=True)
+            return
+
+        await self.store.add(interaction.guild_id, interaction.channel_id, user_id, event.value, minutes)
+        await interaction.response.send_message(
+            f"✅ I'll remind {'this channel' if channel_wide else 'you'} "
+            f"**{minutes} min** before **{event.name}** here.",
+            ephemeral=True
+        )
+
+    @app_commands.command(name="remove", description="Stop a reminder")
+    @app_commands.describe(
+        event="The reminder's event",
+        minutes="The reminder's lead time in minutes",
+        channel_wide="Remove a channel-wide reminder (needs Manage Channels)"
+    )
+    @app_commands.choices(event=TARGET_CHOICES)
+    async def remove(
+        self,
+        interaction: discord.Interaction,
+        event: app_commands.Choice[str],
+        minutes: app_commands.Range[int, 0, 180] = 5,
+        channel_wide: bool = False
+    ):
+        if channel_wide and not self.can_manage(interaction):
+            await interaction.response.send_message(
+                "❌ You need **Manage Channels** for channel-wide reminders.",
+                ephemeral=True
+            )
+            return
+
+        user_id = self.subscriber(interaction, channel_wide)
+        if not self.engine.remove(interaction.channel_id, user_id, event.value, minutes):
+            await interaction.response.send_message("🤷 No such reminder here.", ephemeral=True)
+            return
+
+        await self.store.remove(interaction.channel_id, user_id, event.value, minutes)
+        await interaction.response.send_message("🗑️ Reminder removed.", ephemeral=True)
+
+    @app_commands.command(name="list", description="Show your reminders in this channel")
+    async def list(self, interaction: discord.Interaction):
+        mine = self.engine.subscriptions(interaction.channel_id, interaction.user.id)
+        channel = self.engine.subscriptions(interaction.channel_id, 0)
+
+        if not mine and not channel:
+            await interaction.response.send_message("📭 No reminders in this channel.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title="⏰ Reminders", color=discord.Color.blue())
+        if mine:
+            embed.add_field(
+                name="Yours",
+                value="\n".join(f"{TARGETS[t]} — {lead} min before" for t, lead in mine),
+                inline=False
+            )
+        if channel:
+            embed.add_field(
+                name="This channel",
+                value="\n".join(f"{TARGETS[t]} — {lead} min before" for t, lead in channel),
+                inline=False
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Remind(bot))
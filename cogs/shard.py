@@ -1,97 +1,95 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import datetime
+from typing import Literal, Optional
 
+from utils.shard_config import load_shard_config
+from utils.shard_schedule import ShardSchedule
+from utils.embed_cache import EmbedCache
 
-class Shard(commands.GroupCog, name="shard"):
 
-    def __init__(self, bot: commands.Bot):
-        self.bot = bot
-        self.la = ZoneInfo("America/Los_Angeles")
+DAYS_PER_PAGE = 7
 
-        # Anchor: confirmed BLACK shard day
-        self.anchor_date = datetime.now(self.la).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
 
-        # Global correction (your discovered offset)
-        self.global_time_adjust = timedelta(minutes=8, seconds=40)
+class ShardRangeView(discord.ui.View):
+    def __init__(self, pages, author_id):
+        super().__init__(timeout=300)
+        self.pages = pages
+        self.author_id = author_id
+        self.page = 0
+        self.message = None
+        self.update_buttons()
 
-        self.land_offset = timedelta(minutes=8, seconds=40)
-        self.end_offset = timedelta(hours=4)
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= len(self.pages) - 1
 
-        self.black_interval = timedelta(hours=8)
-        self.red_interval = timedelta(hours=6)
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id == self.author_id:
+            return True
 
-        self.realms = ["Prairie", "Forest", "Valley", "Wasteland", "Vault"]
+        await interaction.response.send_message(
+            "🙅 This isn't your list — run `/shard range` yourself.",
+            ephemeral=True
+        )
+        return False
 
-        # Offsets (same order as original system)
-        self.offsets = [
-            timedelta(hours=1, minutes=50),
-            timedelta(hours=2, minutes=10),
-            timedelta(hours=7, minutes=40),
-            timedelta(hours=2, minutes=20),
-            timedelta(hours=3, minutes=30),
-        ]
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
 
-    # =========================================
-    # BUILD SHARD SYSTEM
-    # =========================================
-    def build_shard(self, current_time, filter_color=None):
-
-        now = current_time.astimezone(self.la)
+        if self.message is None:
+            return
 
-        for days_ahead in range(15):
-            check_time = now + timedelta(days=days_ahead)
-            today = check_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            # Message deleted or the interaction token expired
+            pass
 
-            cycle_day = (today.date() - self.anchor_date.date()).days
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.page], view=self)
 
-            # Alternate daily
-            is_red = (cycle_day % 2) == 1
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.page], view=self)
 
-            # Filter by color if needed
-            if filter_color == "red" and not is_red:
-                continue
-            if filter_color == "black" and is_red:
-                continue
 
-            # Correct 2-group / 3-group rotation
-            half_cycle = cycle_day // 2
+class Shard(commands.GroupCog, name="shard"):
 
-            if is_red:
-                group_index = 2 + (half_cycle % 3)
-            else:
-                group_index = half_cycle % 2
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
 
-            interval = self.red_interval if is_red else self.black_interval
-            first_start = today + self.offsets[group_index]
+        # Anchor, offsets and realm rotation come from a versioned file so
+        # every restart and worker agrees on the schedule
+        self.config = load_shard_config()
+        self.la = self.config.tz
 
-            occurrences = []
-            for i in range(3):
-                start = (
-                    first_start
-                    + (interval * i)
-                    + self.global_time_adjust
-                )
-                end = start + self.end_offset
-                occurrences.append((start, end))
+        self.schedule = ShardSchedule.from_config(self.config)
+        self.embeds = EmbedCache()
 
-            # Skip if today's shard already finished
-            if days_ahead == 0:
-                if now >= occurrences[-1][1]:
-                    continue
+    # =========================================
+    # BUILD SHARD SYSTEM
+    # =========================================
+    def build_shard(self, current_time, filter_color=None):
+        # Index lookup into the precomputed table (rebuilt at LA midnight)
+        return self.schedule.find(current_time, filter_color)
 
-            realm_index = cycle_day % 5
+    def next_occurrence(self, after, filter_color=None, occurrence=0):
+        """POSIX start of the next occurrence after ``after`` (0 = any of the three)."""
+        ts = after.timestamp()
+        slots = range(3) if not occurrence else (occurrence - 1,)
 
-            return {
-                "now": now,
-                "isRed": is_red,
-                "realm": self.realms[realm_index],
-                "occurrences": occurrences,
-            }
+        for day in self.schedule.range(after, self.schedule.lookahead_days, filter_color):
+            for k in slots:
+                if day.starts[k] > ts:
+                    return day.starts[k]
 
         return None
 
@@ -104,6 +102,15 @@ class Shard(commands.GroupCog, name="shard"):
             await interaction.response.send_message("No shard found.")
             return
 
+        embed = self.embed_for(data, title)
+        await interaction.response.send_message(embed=embed)
+
+    def embed_for(self, data, title):
+        # Reused until the next occurrence start/end changes status or countdown
+        key = (title, data["occurrences"][0][0].timestamp())
+        return self.embeds.get_or_render(key, lambda: self.render_embed(data, title))
+
+    def render_embed(self, data, title):
         embed = discord.Embed(
             title=title,
             color=discord.Color.red() if data["isRed"] else discord.Color.dark_gray()
@@ -120,6 +127,7 @@ class Shard(commands.GroupCog, name="shard"):
         status = "Not active"
         countdown = ""
         occurrence_text = ""
+        expires_at = None
 
         for i, (start, end) in enumerate(data["occurrences"], 1):
 
@@ -129,12 +137,15 @@ class Shard(commands.GroupCog, name="shard"):
                 f"End: <t:{int(end.timestamp())}:t>\n\n"
             )
 
+            # Relative timestamps keep counting down without re-rendering
             if start <= now <= end:
                 status = f"🔥 Occurrence {i} ACTIVE"
-                countdown = f"⏳ Ends in `{str(end - now).split('.')[0]}`"
+                countdown = f"⏳ Ends <t:{int(end.timestamp())}:R>"
+                expires_at = end.timestamp()
 
             elif now < start and countdown == "":
-                countdown = f"⏳ Starts in `{str(start - now).split('.')[0]}`"
+                countdown = f"⏳ Starts <t:{int(start.timestamp())}:R>"
+                expires_at = start.timestamp()
 
         embed.add_field(name="Status", value=status, inline=False)
 
@@ -143,7 +154,52 @@ class Shard(commands.GroupCog, name="shard"):
 
         embed.add_field(name="Occurrences", value=occurrence_text, inline=False)
 
-        await interaction.response.send_message(embed=embed)
+        if expires_at is None:
+            expires_at = data["occurrences"][-1][1].timestamp()
+
+        return embed, expires_at
+
+    def build_range_pages(self, days, title):
+        pages = []
+
+        for first in range(0, len(days), DAYS_PER_PAGE):
+            chunk = days[first:first + DAYS_PER_PAGE]
+            embed = discord.Embed(title=title, color=discord.Color.blurple())
+
+            for day in chunk:
+                times = " · ".join(
+                    f"<t:{int(start)}:t>–<t:{int(end)}:t>"
+                    for start, end in zip(day.starts, day.ends)
+                )
+                embed.add_field(
+                    name=f"{'🔴' if day.is_red else '⚫'} {day.date:%a %b %d} — {day.realm}",
+                    value=times,
+                    inline=False
+                )
+
+            pages.append(embed)
+
+        for number, embed in enumerate(pages, 1):
+            embed.set_footer(text=f"Page {number}/{len(pages)}")
+
+        return pages
+
+    async def send_range(self, interaction, days, color, title):
+        shards = self.schedule.range(datetime.now(self.la), days, color)
+
+        if not shards:
+            await interaction.response.send_message("No shard found.")
+            return
+
+        pages = self.build_range_pages(shards, title)
+
+        if len(pages) == 1:
+            await interaction.response.send_message(embed=pages[0])
+            return
+
+        view = ShardRangeView(pages, interaction.user.id)
+        await interaction.response.send_message(embed=pages[0], view=view)
+        view.message = await interaction.original_response()
 
     # =========================================
     # COMMANDS
@@ -169,6 +225,25 @@ class Shard(commands.GroupCog, name="shard"):
         data = self.build_shard(datetime.now(self.la), "black")
         await self.send_embed(interaction, data, "Next Black Shard")
 
+    @app_commands.command(name="week", description="All shards in the next 7 days")
+    @app_commands.describe(color="Only show red or black shards")
+    async def week(
+        self,
+        interaction: discord.Interaction,
+        color: Optional[Literal["red", "black"]] = None
+    ):
+        await self.send_range(interaction, 7, color, "Shards This Week")
+
+    @app_commands.command(name="range", description="All shards in the next N days")
+    @app_commands.describe(days="How many days to list (1-30)", color="Only show red or black shards")
+    async def range(
+        self,
+        interaction: discord.Interaction,
+        days: app_commands.Range[int, 1, 30],
+        color: Optional[Literal["red", "black"]] = None
+    ):
+        await self.send_range(interaction, days, color, f"Shards in the Next {days} Days")
+
 
 async def setup(bot):
     await bot.add_cog(Shard(bot))
@@ -0,0 +1,100 @@
+import math
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from utils.metrics import METRICS
+
+
+def ms(seconds):
+    return f"{seconds * 1000:.0f}ms"
+
+
+def quantile_line(summary):
+    q = summary.quantiles()
+    return f"p50 {ms(q[0.5])} · p95 {ms(q[0.95])} · p99 {ms(q[0.99])} ({summary.count})"
+
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    def build_embed(self):
+        embed = discord.Embed(title="📈 Zee Stats", color=discord.Color.blurple())
+
+        # Slowest commands first
+        commands_ = sorted(
+            METRICS.series("command_latency_seconds"),
+            key=lambda item: -item[1].quantiles()[0.95]
+        )
+        errors = {}
+        for labels, value in METRICS.counter_series("command_errors_total"):
+            errors[labels["command"]] = errors.get(labels["command"], 0) + value
+
+        lines = [
+            f"`/{labels['command']}` {quantile_line(summary)}"
+            + (f" · ❌ {errors[labels['command']]}" if labels["command"] in errors else "")
+            for labels, summary in commands_[:10]
+        ]
+        embed.add_field(name="Commands", value="\n".join(lines) or "No commands yet", inline=False)
+
+        lines = [
+            f"**{labels['service']}** {quantile_line(summary)}"
+            for labels, summary in sorted(
+                METRICS.series("http_request_seconds"), key=lambda item: item[0]["service"]
+            )
+        ]
+        http_errors = METRICS.counter_series("http_errors_total")
+        if http_errors:
+            lines.append("Errors: " + ", ".join(f"{l['service']} {v}" for l, v in http_errors))
+        embed.add_field(name="HTTP", value="\n".join(lines) or "No requests yet", inline=False)
+
+        lines = []
+        lag = METRICS.summary("event_loop_lag_seconds")
+        if lag:
+            lines.append(f"Loop lag {quantile_line(lag)}")
+        delivery = METRICS.summary("interaction_delivery_seconds")
+        if delivery:
+            lines.append(f"Delivery {quantile_line(delivery)}")
+        if math.isfinite(self.bot.latency):
+            lines.append(f"Heartbeat {ms(self.bot.latency)}")
+        embed.add_field(name="Gateway", value="\n".join(lines) or "No samples yet", inline=False)
+
+        giphy = self.bot.giphy
+        cache = giphy.cache
+        breaker = f"{giphy.breaker.state} ({giphy.breaker.trips} trips)"
+        if giphy.breaker.state == "open":
+            breaker += f", retry in {giphy.breaker.retry_in():.0f}s"
+        lines = [
+            f"Search cache: {cache.hits} hit · {cache.stale_hits} stale · {cache.misses} miss",
+            f"Breaker: {breaker} · {giphy.bucket.available()} requests left in burst"
+            f" · {len(giphy.fallback)} fallback queries",
+        ]
+        for cog in self.bot.cogs.values():
+            for pool in getattr(cog, "pools", {}).values():
+                s = pool.stats()
+                lines.append(f"{s['query']}: {s['size']} GIFs · {s['hits']} hit · {s['misses']} miss")
+        embed.add_field(name="Giphy", value="\n".join(lines), inline=False)
+
+        ai = self.bot.get_cog("AI")
+        if ai is not None:
+            s = ai.answers.stats()
+            embed.add_field(
+                name="Ask Zee",
+                value=(
+                    f"Model: {ai.model_state}\n"
+                    f"Answer cache: {s['hit_rate']:.0%} hit rate ({s['hits']}/{s['hits'] + s['misses']})"
+                ),
+                inline=False
+            )
+
+        return embed
+
+    @app_commands.command(name="stats", description="Latency and cache stats (admins only)")
+    @app_commands.default_permissions(administrator=True)
+    async def stats(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self.build_embed(), ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
@@ -0,0 +1,448 @@
+"""Load-test every slash command offline.
+
+Starts local stand-ins for the Giphy search API and Ollama's /api/generate,
+points the bot at them, loads the real cogs (no Discord login) and invokes
+each command through fake interactions at several concurrency levels.
+Reports throughput and p50/p95/p99 latency per command.
+
+    python scripts/bench_commands.py
+    python scripts/bench_commands.py --concurrency 1,16,64 --giphy-latency 0.15
+    python scripts/bench_commands.py --commands ask --token-latency 0.05
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import itertools
+import statistics
+
+import discord
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GIPHY_RESULTS = 500  # results per query the fake Giphy pretends to have
+GIFZ_QUERIES = 20
+
+
+# =========================================
+# STUB SERVERS
+# =========================================
+class GiphyStub:
+    """Answers /v1/gifs/search like Giphy, after ``latency`` seconds."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+        self.status = 200  # set to 429/5xx to simulate an outage
+
+    async def search(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+        if self.status != 200:
+            return web.json_response({"message": "stub outage"}, status=self.status)
+
+        query = request.query.get("q", "")
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 25))
+        ids = range(offset, min(offset + limit, GIPHY_RESULTS))
+
+        return web.json_response({
+            "data": [
+                {"images": {"original": {"url": f"https://stub.invalid/{query}/{i}.gif"}}}
+                for i in ids
+            ]
+        })
+
+
+class OllamaStub:
+    """Answers /api/generate and /api/ps like a local Ollama.
+
+    ``latency`` is the time to first token (prompt evaluation); every token
+    after that takes ``token_latency``. Replies open with a short <think>
+    section unless the request sets ``think: false``.
+    """
+
+    THINK_TOKENS = 12
+
+    def __init__(self, latency, token_latency, tokens):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.tokens = tokens
+        self.loaded = set()
+        self.requests = 0
+
+    def reply_tokens(self, payload):
+        if payload.get("think", True):
+            yield "<think>"
+            for i in range(self.THINK_TOKENS):
+                yield f" hmm{i}"
+            yield "</think>\n\n"
+
+        for i in range(self.tokens):
+            yield f"word{i} "
+
+    async def ps(self, request):
+        return web.json_response({"models": [{"name": name} for name in sorted(self.loaded)]})
+
+    async def generate(self, request):
+        payload = await request.json()
+        self.loaded.add(payload.get("model"))
+
+        # Preload: no prompt, nothing generated
+        if not payload.get("prompt"):
+            return web.json_response({"model": payload.get("model"), "done": True})
+
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        done = {"response": "", "done": True, "context": [1, 2, 3]}
+
+        if not payload.get("stream", True):
+            text = []
+            for token in self.reply_tokens(payload):
+                await asyncio.sleep(self.token_latency)
+                text.append(token)
+            return web.json_response(dict(done, response="".join(text)))
+
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await resp.prepare(request)
+        for token in self.reply_tokens(payload):
+            await asyncio.sleep(self.token_latency)
+            await resp.write(json.dumps({"response": token, "done": False}).encode() + b"\n")
+        await resp.write(json.dumps(done).encode() + b"\n")
+        await resp.write_eof()
+        return resp
+
+
+async def serve(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+# =========================================
+# FAKE DISCORD
+# =========================================
+class FakeMember:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.display_name = f"User {user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+
+class FakeMessage:
+    def __init__(self, api, content=None):
+        self.api = api
+        self.content = content
+
+    async def edit(self, content=None, **kwargs):
+        await self.api.call("edit")
+        if content is not None:
+            self.content = content
+        return self
+
+
+class FakeResponse:
+    def __init__(self, api):
+        self.api = api
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self, kind):
+        if self._done:
+            raise RuntimeError("interaction already responded to")
+        self._done = True
+        await self.api.call(kind)
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond("send_message")
+        if content and content.startswith("❌"):
+            self.api.failed += 1  # a command told the user it couldn't fetch a GIF
+
+    async def defer(self, **kwargs):
+        await self._respond("defer")
+
+    async def edit_message(self, **kwargs):
+        await self._respond("edit_message")
+
+
+class FakeWebhook:
+    def __init__(self, api):
+        self.api = api
+
+    async def send(self, content=None, *, wait=False, **kwargs):
+        await self.api.call("followup")
+        if content and content.startswith("🚦"):
+            self.api.rejected += 1  # /ask turned away by the inference queue
+        return FakeMessage(self.api, content) if wait else None
+
+
+class FakeDiscordAPI:
+    """Counts the REST calls commands make and simulates their round trip."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = {}
+        self.rejected = 0
+        self.failed = 0
+
+    async def call(self, kind):
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeInteraction:
+    """Just enough of ``discord.Interaction`` for the cogs' command bodies."""
+
+    def __init__(self, api, user_id, channel_id=1000, guild_id=2000):
+        self.user = FakeMember(user_id)
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.created_at = discord.utils.utcnow()
+        self.extras = {}
+        self.command = None
+        self.api = api
+        self.response = FakeResponse(api)
+        self.followup = FakeWebhook(api)
+
+    async def original_response(self):
+        await self.api.call("original_response")
+        return FakeMessage(self.api)
+
+
+# =========================================
+# SCENARIOS
+# =========================================
+# (label, command path, kwargs for the n-th call); reaction commands are
+# added from cogs.reactions.ACTIONS once the bot is imported
+SCENARIOS = [
+    ("gifz", "gifz", lambda n: {"query": f"cat {n % GIFZ_QUERIES}"}),
+    ("greet", "greet", lambda n: {"user": FakeMember(n + 1)}),
+    ("events", "events", lambda n: {}),
+    ("shard today", "shard today", lambda n: {}),
+    ("shard next", "shard next", lambda n: {}),
+    ("shard red", "shard red", lambda n: {}),
+    ("shard black", "shard black", lambda n: {}),
+    ("shard week", "shard week", lambda n: {"color": None}),
+    ("shard range", "shard range", lambda n: {"days": 30, "color": None}),
+    ("ask", "ask", lambda n: {"question": f"What is {n} plus {n}?", "fast": False}),
+]
+
+
+def find_command(tree, path):
+    command = None
+    for part in path.split():
+        command = tree.get_command(part) if command is None else command.get_command(part)
+        if command is None:
+            return None
+    return command
+
+
+async def invoke(command, interaction, kwargs):
+    interaction.command = command
+    if command.binding is not None:
+        await command.callback(command.binding, interaction, **kwargs)
+    else:
+        await command.callback(interaction, **kwargs)
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_level(command, make_kwargs, api, requests, concurrency):
+    counter = itertools.count()
+    latencies = []
+    errors = []
+
+    async def worker():
+        while True:
+            n = next(counter)
+            if n >= requests:
+                return
+
+            # A distinct user per call: per-user limits shouldn't skew throughput
+            interaction = FakeInteraction(api, user_id=10_000 + n)
+            start = time.perf_counter()
+            try:
+                await invoke(command, interaction, make_kwargs(n))
+            except Exception as e:
+                errors.append(e)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "errors": errors,
+    }
+
+
+def print_row(label, concurrency, result):
+    print(
+        f"  {label:<12} c={concurrency:<4} {result['rps']:9.1f} req/s   "
+        f"p50 {result['p50'] * 1000:8.2f} ms   "
+        f"p95 {result['p95'] * 1000:8.2f} ms   "
+        f"p99 {result['p99'] * 1000:8.2f} ms"
+        + (f"   errors {len(result['errors'])}" if result["errors"] else "")
+    )
+
+
+# =========================================
+# MAIN
+# =========================================
+async def bench(args):
+    giphy = GiphyStub(args.giphy_latency)
+    ollama = OllamaStub(args.ollama_latency, args.token_latency, args.tokens)
+
+    giphy_runner, giphy_url = await serve([web.get("/v1/gifs/search", giphy.search)])
+    ollama_runner, ollama_url = await serve([
+        web.post("/api/generate", ollama.generate),
+        web.get("/api/ps", ollama.ps),
+    ])
+
+    data_dir = tempfile.TemporaryDirectory(prefix="zee-bench-")
+
+    # Module-level settings are read at import, so set them before importing the bot
+    os.environ.update({
+        "BOT_ENV": "prod",
+        "METRICS_PORT": "0",
+        "GIPHY_API_KEY": "bench",
+        "GIPHY_URL": giphy_url + "/v1/gifs/search",
+        "GIPHY_RATE_LIMIT": str(args.giphy_rate_limit),
+        "GIPHY_RATE_BURST": str(args.giphy_rate_limit),
+        "GIPHY_FALLBACK": os.path.join(data_dir.name, "giphy_fallback.json"),
+        "GIPHY_FALLBACK_BUNDLED": os.path.join(data_dir.name, "bundled.json"),
+        "OLLAMA_URL": ollama_url,
+        "ZEE_ANSWER_CACHE": os.path.join(data_dir.name, "answers.sqlite3"),
+        "ZEE_REMINDER_DB": os.path.join(data_dir.name, "reminders.sqlite3"),
+        "ZEE_BOARD_DB": os.path.join(data_dir.name, "boards.sqlite3"),
+        "ZEE_COMMAND_HASH": os.path.join(data_dir.name, "command_tree.json"),
+    })
+    os.chdir(ROOT)
+
+    import bot as zee
+    from cogs.reactions import ACTIONS
+    from utils.metrics import METRICS, monitor_loop_lag
+
+    bot = zee.bot
+    api = FakeDiscordAPI(args.discord_latency)
+
+    lag_task = asyncio.create_task(monitor_loop_lag())
+    try:
+        async with bot:
+            await bot.load_extensions()
+
+            # No gateway here: mark the client ready so after-ready work
+            # (GIF pool fills, model warm-up) runs against the stubs
+            bot._ready.set()
+            await asyncio.sleep(args.warmup)
+
+            if args.giphy_outage:
+                # Let every gifz query succeed once, then fail all Giphy calls
+                for k in range(GIFZ_QUERIES):
+                    await bot.giphy.search(f"cat {k}", rating="pg-13", limit=10)
+                giphy.status = 429
+
+            wanted = set(args.commands.split(",")) if args.commands else None
+            levels = [int(c) for c in args.concurrency.split(",")]
+
+            print(
+                f"\nGiphy latency {args.giphy_latency * 1000:.0f} ms · "
+                f"Ollama first token {args.ollama_latency * 1000:.0f} ms, "
+                f"{args.token_latency * 1000:.0f} ms/token · "
+                f"Discord REST {args.discord_latency * 1000:.0f} ms\n"
+            )
+
+            reactions = [
+                (action.name, action.name, lambda n: {"user": FakeMember(n + 1)})
+                for action in ACTIONS
+            ]
+            scenarios = SCENARIOS[:1] + reactions + SCENARIOS[1:]
+
+            for label, path, make_kwargs in scenarios:
+                if wanted and label not in wanted and path.split()[0] not in wanted:
+                    continue
+
+                command = find_command(bot.tree, path)
+                if command is None:
+                    print(f"  {label:<12} not loaded, skipped")
+                    continue
+
+                requests = args.ask_requests if path == "ask" else args.requests
+                for concurrency in levels:
+                    if args.giphy_outage:
+                        bot.giphy.cache.clear()  # force the fallback path
+                    result = await run_level(command, make_kwargs, api, requests, concurrency)
+                    print_row(label, concurrency, result)
+                    if result["errors"] and args.verbose:
+                        print("    first error:", repr(result["errors"][0]))
+
+            print(f"\nStub traffic: Giphy {giphy.requests} requests · Ollama {ollama.requests} generations")
+            print("Discord calls: " + ", ".join(f"{k} {v}" for k, v in sorted(api.calls.items())))
+            if api.failed:
+                print(f"Commands that couldn't fetch a GIF: {api.failed}")
+            if args.giphy_outage:
+                breaker = bot.giphy.breaker
+                print(f"Giphy breaker: {breaker.state}, tripped {breaker.trips} time(s)")
+            if api.rejected:
+                print(f"/ask rejected by the queue: {api.rejected}")
+            for labels, summary in METRICS.series("http_request_seconds"):
+                q = summary.quantiles()
+                print(
+                    f"HTTP {labels['service']:<14} {summary.count:6d} requests   "
+                    f"p50 {q[0.5] * 1000:8.2f} ms   p99 {q[0.99] * 1000:8.2f} ms"
+                )
+            lag = METRICS.summary("event_loop_lag_seconds")
+            if lag:
+                print(f"Event loop lag  max {max(lag.samples) * 1000:.2f} ms, mean {statistics.mean(lag.samples) * 1000:.2f} ms")
+    finally:
+        lag_task.cancel()
+        await giphy_runner.cleanup()
+        await ollama_runner.cleanup()
+        data_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", default="", help="comma-separated subset, e.g. gifz,shard,ask")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="calls per command per level")
+    parser.add_argument("--ask-requests", type=int, default=20, help="calls per level for /ask")
+    parser.add_argument("--giphy-latency", type=float, default=0.08, help="seconds per Giphy search")
+    parser.add_argument("--giphy-rate-limit", type=int, default=1_000_000, help="Giphy requests per hour")
+    parser.add_argument("--giphy-outage", action="store_true", help="answer Giphy with 429 after warm-up")
+    parser.add_argument("--ollama-latency", type=float, default=0.2, help="seconds to first token")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="seconds per generated token")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens per /ask reply")
+    parser.add_argument("--discord-latency", type=float, default=0.0, help="seconds per Discord REST call")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds to let pools fill before measuring")
+    parser.add_argument("--verbose", action="store_true", help="print the first error of each level")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
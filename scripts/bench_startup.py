@@ -0,0 +1,115 @@
+"""Measure Zee's cold-start cost.
+
+Import times are measured in a fresh interpreter per sample, so nothing is
+already cached in ``sys.modules``. With ``--ready`` (and DISCORD_TOKEN set)
+the real bot is also started with ZEE_EXIT_ON_READY=1 to time a full boot
+up to the gateway READY event.
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --ready
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "discord",
+    "aiohttp",
+    "bot",
+] + sorted(
+    f"cogs.{name[:-3]}" for name in os.listdir(os.path.join(ROOT, "cogs"))
+    if name.endswith(".py")
+)
+
+IMPORT_SNIPPET = (
+    "import time, importlib\n"
+    "t = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "print(time.perf_counter() - t)\n"
+)
+
+READY_LINE = re.compile(r"Ready in ([0-9.]+)s")
+
+
+def run_python(code, env=None, timeout=120):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+
+def bench_import(module, runs):
+    samples = []
+    for _ in range(runs):
+        result = run_python(IMPORT_SNIPPET.format(module=module))
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return samples, None
+
+
+def bench_ready(runs):
+    env = dict(os.environ, ZEE_EXIT_ON_READY="1")
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "bot.py"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+        match = READY_LINE.search(result.stdout)
+        if not match:
+            print(result.stdout[-2000:], result.stderr[-2000:], sep="\n")
+            raise SystemExit("bot never reported ready")
+        samples.append(float(match.group(1)))
+    return samples
+
+
+def fmt(samples):
+    return (
+        f"median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms   "
+        f"max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--ready", action="store_true", help="also time a real boot to READY")
+    args = parser.parse_args()
+
+    # Importing bot must not connect; cogs must import without secrets
+    os.environ.setdefault("BOT_ENV", "prod")
+
+    print(f"Import time ({args.runs} fresh interpreters each):")
+    for module in MODULES:
+        samples, error = bench_import(module, args.runs)
+        if samples is None:
+            print(f"  {module:<16} failed: {error}")
+        else:
+            print(f"  {module:<16} {fmt(samples)}")
+
+    if args.ready:
+        if not os.getenv("DISCORD_TOKEN"):
+            raise SystemExit("--ready needs DISCORD_TOKEN")
+
+        samples = bench_ready(args.runs)
+        print(f"\nTime to ready ({args.runs} boots):")
+        print(f"  {'bot.py':<16} {fmt(samples)}")
+
+
+if __name__ == "__main__":
+    main()
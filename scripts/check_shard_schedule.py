@@ -0,0 +1,144 @@
+"""Check that ShardSchedule.find matches the original shard calculator.
+
+``reference_build_shard`` is the day-by-day scan the shard cog used before
+the precomputed schedule (kept verbatim apart from taking its settings as
+arguments). Both are run on the same times and every field is compared:
+random times over a year, every minute around each DST change, and the
+seconds around every occurrence boundary.
+
+    python scripts/check_shard_schedule.py
+    python scripts/check_shard_schedule.py --samples 60000 --seed 7
+"""
+import os
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.shard_config import load_shard_config
+from utils.shard_schedule import ShardSchedule
+
+
+def reference_build_shard(config, current_time, filter_color=None):
+    la = config.tz
+    anchor_date = datetime.combine(config.anchor_date, datetime.min.time(), la)
+    now = current_time.astimezone(la)
+
+    for days_ahead in range(15):
+        check_time = now + timedelta(days=days_ahead)
+        today = check_time.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        cycle_day = (today.date() - anchor_date.date()).days
+
+        # Alternate daily
+        is_red = (cycle_day % 2) == 1
+
+        if filter_color == "red" and not is_red:
+            continue
+        if filter_color == "black" and is_red:
+            continue
+
+        # Correct 2-group / 3-group rotation
+        half_cycle = cycle_day // 2
+
+        if is_red:
+            group_index = 2 + (half_cycle % 3)
+        else:
+            group_index = half_cycle % 2
+
+        interval = config.red_interval if is_red else config.black_interval
+        first_start = today + config.offsets[group_index]
+
+        occurrences = []
+        for i in range(3):
+            start = first_start + (interval * i) + config.global_time_adjust
+            end = start + config.end_offset
+            occurrences.append((start, end))
+
+        # Skip if today's shard already finished
+        if days_ahead == 0:
+            if now >= occurrences[-1][1]:
+                continue
+
+        return {
+            "now": now,
+            "isRed": is_red,
+            "realm": config.realms[cycle_day % 5],
+            "occurrences": occurrences,
+        }
+
+    return None
+
+
+def summary(data):
+    if data is None:
+        return None
+    return (
+        data["isRed"],
+        data["realm"],
+        tuple((start.timestamp(), end.timestamp()) for start, end in data["occurrences"]),
+    )
+
+
+def sample_times(config, samples, rng):
+    tz = config.tz
+    start = datetime.combine(config.anchor_date, datetime.min.time(), tz)
+    year = 365 * 86400
+
+    # Uniform over a year
+    for _ in range(samples):
+        yield start + timedelta(seconds=rng.randint(0, year))
+
+    # Every minute of the days around each UTC-offset change
+    day = start
+    while day < start + timedelta(days=365):
+        following = day + timedelta(days=1)
+        if day.utcoffset() != following.utcoffset():
+            for minute in range(3 * 24 * 60):
+                yield (day - timedelta(days=1)) + timedelta(minutes=minute)
+        day = following
+
+    # Just before, at and after every occurrence boundary for 60 days
+    reference = reference_build_shard(config, start)
+    for offset in range(60):
+        data = reference_build_shard(config, start + timedelta(days=offset))
+        for edge in (t for pair in (data or reference)["occurrences"] for t in pair):
+            for delta in (-1, 0, 1):
+                yield edge + timedelta(seconds=delta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20000, help="random times to check")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = load_shard_config(os.path.join(ROOT, "config", "shard.json"))
+    schedule = ShardSchedule.from_config(config)
+    rng = random.Random(args.seed)
+
+    checked = 0
+    mismatches = 0
+    for when in sample_times(config, args.samples, rng):
+        for color in (None, "red", "black"):
+            expected = summary(reference_build_shard(config, when, color))
+            actual = summary(schedule.find(when, color))
+            checked += 1
+
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"MISMATCH at {when.isoformat()} color={color}")
+                    print(f"  expected {expected}")
+                    print(f"  actual   {actual}")
+
+    print(f"{checked} lookups, {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
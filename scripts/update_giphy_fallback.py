@@ -0,0 +1,62 @@
+"""Generate config/giphy_fallback.json from the Giphy API.
+
+The bundled file is what reaction commands fall back to when Giphy is
+unreachable on a fresh boot (before anything has been fetched and saved to
+data/). It isn't checked in: run this before deploying, with a real key,
+and ship the output with the bot. Without it a first boot during an outage
+has no GIFs until Giphy is back.
+
+    GIPHY_API_KEY=... python scripts/update_giphy_fallback.py
+    GIPHY_API_KEY=... python scripts/update_giphy_fallback.py --per-query 25
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cogs.reactions import ACTIONS
+from utils.giphy import GIPHY_API_KEY, FALLBACK_BUNDLED_PATH, GiphyClient, GiphyError
+
+
+async def build(per_query):
+    # fallback_path=None: leave data/ and its saved budget alone
+    giphy = GiphyClient(fallback_path=None)
+    entries = []
+
+    try:
+        for action in ACTIONS:
+            try:
+                urls = await giphy.fetch(action.query, action.rating, per_query, 0)
+            except GiphyError as e:
+                raise SystemExit(f"{action.name}: {e}")
+
+            print(f"  {action.name:<8} {len(urls):3d} URLs for {action.query!r}")
+            entries.append({"query": action.query, "rating": action.rating, "urls": list(urls)})
+    finally:
+        await giphy.close()
+
+    return {"version": 1, "entries": entries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-query", type=int, default=50, help="URLs per action (max 50)")
+    parser.add_argument("--output", default=os.path.join(ROOT, FALLBACK_BUNDLED_PATH))
+    args = parser.parse_args()
+
+    if not GIPHY_API_KEY:
+        raise SystemExit("GIPHY_API_KEY is not set")
+
+    data = asyncio.run(build(min(args.per_query, 50)))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import re
+import time
+import hashlib
+import unicodedata
+
+from utils.sqlite_store import SQLiteStore
+
+ANSWER_CACHE_PATH = os.getenv("ZEE_ANSWER_CACHE", "data/answer_cache.sqlite3")
+ANSWER_CACHE_TTL = int(os.getenv("ZEE_ANSWER_CACHE_TTL", str(7 * 24 * 3600)))
+ANSWER_CACHE_MAX = int(os.getenv("ZEE_ANSWER_CACHE_MAX", "5000"))
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text):
+    """Fold case, punctuation and spacing so near-duplicate questions match.
+
+    "Who are you?", "who are you" and "  WHO ARE YOU!! " all normalize to
+    "who are you".
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class AnswerCache(SQLiteStore):
+    """Persistent /ask answer cache in SQLite.
+
+    Keyed on the normalized question plus the model and system prompt, so
+    changing either invalidates old answers. Entries expire after ``ttl``
+    seconds and the least recently used ones are evicted past
+    ``max_entries``.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS answers ("
+        " key TEXT PRIMARY KEY,"
+        " prompt TEXT NOT NULL,"
+        " answer TEXT NOT NULL,"
+        " created REAL NOT NULL,"
+        " last_used REAL NOT NULL,"
+        " hits INTEGER NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)",
+    )
+
+    def __init__(self, path=ANSWER_CACHE_PATH, ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def make_key(question, model, system_prompt):
+        raw = "\0".join((model, system_prompt, normalize_prompt(question)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+    async def open(self):
+        await super().open()
+        await self.execute("DELETE FROM answers WHERE created < ?", (time.time() - self.ttl,))
+
+    async def get(self, question, model, system_prompt):
+        key = self.make_key(question, model, system_prompt)
+        answer = await self._lookup(key)
+
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return answer
+
+    async def put(self, question, model, system_prompt, answer):
+        key = self.make_key(question, model, system_prompt)
+        now = time.time()
+
+        await self.execute(
+            "INSERT OR REPLACE INTO answers (key, prompt, answer, created, last_used, hits)"
+            " VALUES (?, ?, ?, ?, ?, 0)",
+            (key, normalize_prompt(question), answer, now, now)
+        )
+
+        # LRU eviction past the size bound
+        await self.execute(
+            "DELETE FROM answers WHERE key IN ("
+            " SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self.stores += 1
+
+    async def _lookup(self, key):
+        rows = await self.query("SELECT answer, created FROM answers WHERE key = ?", (key,))
+        if not rows:
+            return None
+
+        answer, created = rows[0]
+        now = time.time()
+
+        if now - created > self.ttl:
+            await self.execute("DELETE FROM answers WHERE key = ?", (key,))
+            return None
+
+        await self.execute(
+            "UPDATE answers SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+        )
+        return answer
@@ -0,0 +1,31 @@
+import os
+
+from utils.sqlite_store import SQLiteStore
+
+BOARD_DB_PATH = os.getenv("ZEE_BOARD_DB", "data/boards.sqlite3")
+
+
+class BoardStore(SQLiteStore):
+    """SQLite persistence for live board messages, one per guild."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS boards ("
+        " guild_id INTEGER PRIMARY KEY,"
+        " channel_id INTEGER NOT NULL,"
+        " message_id INTEGER NOT NULL)",
+    )
+
+    def __init__(self, path=BOARD_DB_PATH):
+        super().__init__(path)
+
+    async def load(self):
+        return await self.query("SELECT guild_id, channel_id, message_id FROM boards")
+
+    async def set(self, guild_id, channel_id, message_id):
+        await self.execute(
+            "INSERT OR REPLACE INTO boards (guild_id, channel_id, message_id) VALUES (?, ?, ?)",
+            (guild_id, channel_id, message_id)
+        )
+
+    async def remove(self, guild_id):
+        await self.execute("DELETE FROM boards WHERE guild_id = ?", (guild_id,))
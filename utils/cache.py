@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Size-bounded LRU cache with a per-entry TTL and a stale grace window.
+
+    ``get`` returns ``(value, fresh)``. Entries older than ``ttl`` but younger
+    than ``ttl + stale_ttl`` are still returned with ``fresh=False`` so the
+    caller can serve them while revalidating in the background.
+    """
+
+    def __init__(self, maxsize=256, ttl=600, stale_ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+
+        if age > self.ttl + self.stale_ttl:
+            del self._data[key]
+            self.misses += 1
+            return None, False
+
+        self._data.move_to_end(key)
+
+        if age > self.ttl:
+            self.stale_hits += 1
+            return value, False
+
+        self.hits += 1
+        return value, True
+
+    def set(self, key, value):
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._data.clear()
@@ -0,0 +1,119 @@
+import os
+import time
+from array import array
+from collections import OrderedDict, deque
+
+# Rough budget for everything sent to the model per request (prompt + history)
+CONTEXT_TOKENS = int(os.getenv("ZEE_CONTEXT_TOKENS", "3072"))
+IDLE_SECONDS = int(os.getenv("ZEE_MEMORY_IDLE", "1800"))
+MAX_CONVERSATIONS = int(os.getenv("ZEE_MEMORY_MAX", "1000"))
+SWEEP_SECONDS = 60
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting English chat
+    return len(text) // 4 + 1
+
+
+class Conversation:
+    __slots__ = ("turns", "tokens", "context", "last_used")
+
+    def __init__(self):
+        self.turns = deque()   # (question, reply, tokens)
+        self.tokens = 0
+        self.context = None    # Ollama KV context ids from the last reply
+        self.last_used = time.monotonic()
+
+
+class ConversationStore:
+    """Bounded per-(channel, user) chat history for /ask.
+
+    When Ollama handed back a ``context`` for the previous reply it is reused,
+    so a follow-up only sends the new turn instead of re-processing the whole
+    prefix. Otherwise the prompt is rebuilt from the text history, dropping
+    the oldest turns to stay within ``budget`` tokens. Conversations idle
+    for ``idle_seconds`` are evicted, as are the least recently used ones past
+    ``max_conversations``.
+    """
+
+    def __init__(self, budget=CONTEXT_TOKENS, idle_seconds=IDLE_SECONDS, max_conversations=MAX_CONVERSATIONS):
+        self.budget = budget
+        self.idle_seconds = idle_seconds
+        self.max_conversations = max_conversations
+
+        self._conversations = OrderedDict()
+        self._last_sweep = time.monotonic()
+
+    def __len__(self):
+        return len(self._conversations)
+
+    def has_history(self, key):
+        self.sweep()
+        conv = self._conversations.get(key)
+        return conv is not None and bool(conv.turns)
+
+    def forget(self, key):
+        return self._conversations.pop(key, None) is not None
+
+    def build_prompt(self, key, system_prompt, question):
+        """Return ``(prompt, context)`` for the next turn of ``key``."""
+        self.sweep()
+        conv = self._conversations.get(key)
+        turn = f"User: {question}\nZee:"
+
+        if conv is None or not conv.turns:
+            return f"{system_prompt}\n\n{turn}", None
+
+        if conv.context is not None and len(conv.context) + estimate_tokens(turn) <= self.budget:
+            return f"\n\n{turn}", conv.context.tolist()
+
+        # No reusable KV context: replay as much text history as fits
+        budget = self.budget - estimate_tokens(system_prompt) - estimate_tokens(turn)
+        history = []
+        for q, a, tokens in reversed(conv.turns):
+            if tokens > budget:
+                break
+            budget -= tokens
+            history.append(f"User: {q}\nZee: {a}\n")
+
+        history.reverse()
+        return f"{system_prompt}\n\n{''.join(history)}{turn}", None
+
+    def record(self, key, question, reply, context=None):
+        conv = self._conversations.get(key)
+        if conv is None:
+            conv = self._conversations[key] = Conversation()
+
+        self._conversations.move_to_end(key)
+        conv.last_used = time.monotonic()
+
+        tokens = estimate_tokens(question) + estimate_tokens(reply)
+        conv.turns.append((question, reply, tokens))
+        conv.tokens += tokens
+
+        while conv.tokens > self.budget and len(conv.turns) > 1:
+            conv.tokens -= conv.turns.popleft()[2]
+
+        # Only keep the KV context while it still fits the budget
+        if context and len(context) <= self.budget:
+            conv.context = array("i", context)
+        else:
+            conv.context = None
+
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep < SWEEP_SECONDS:
+            return
+
+        self._last_sweep = now
+        cutoff = now - self.idle_seconds
+
+        # OrderedDict is in least-recently-used order
+        while self._conversations:
+            key, conv = next(iter(self._conversations.items()))
+            if conv.last_used >= cutoff:
+                break
+            del self._conversations[key]
@@ -0,0 +1,53 @@
+import time
+
+
+class EmbedCache:
+    """Rendered embeds reused until the next time boundary that changes them.
+
+    Embeds that only use ``<t:…>`` timestamps look the same to every viewer
+    until an event starts or ends, so each entry carries the POSIX time at
+    which it goes stale instead of a fixed TTL.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._entries = {}
+
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, key, now_ts=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        embed, expires_at = entry
+        if (time.time() if now_ts is None else now_ts) >= expires_at:
+            del self._entries[key]
+            return None
+
+        self.hits += 1
+        return embed
+
+    def set(self, key, embed, expires_at):
+        if len(self._entries) >= self.maxsize:
+            # Drop whatever has already expired, then the oldest entry
+            now = time.time()
+            for k in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                del self._entries[k]
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+        self._entries[key] = (embed, expires_at)
+        self.renders += 1
+
+    def get_or_render(self, key, render, now_ts=None):
+        """Return the cached embed for ``key`` or call ``render() -> (embed, expires_at)``."""
+        embed = self.get(key, now_ts)
+        if embed is None:
+            embed, expires_at = render()
+            self.set(key, embed, expires_at)
+        return embed
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,135 @@
+import os
+import random
+import asyncio
+
+from utils.giphy import GiphyError
+
+POOL_SIZE = int(os.getenv("GIF_POOL_SIZE", "300"))
+POOL_PAGE_SIZE = 50  # Giphy's max page size for standard keys
+POOL_REFRESH_SECONDS = int(os.getenv("GIF_POOL_REFRESH", "21600"))  # 6h
+POOL_RETRY_SECONDS = 60
+
+
+class GifPool:
+    """A locally held set of GIF URLs for one fixed query.
+
+    A background task fills it with paginated Giphy requests and refreshes it
+    periodically, so ``pick`` normally makes no HTTP call at all.
+    """
+
+    def __init__(self, giphy, query, rating="", size=POOL_SIZE):
+        self.giphy = giphy
+        self.query = query
+        self.rating = rating
+        self.size = size
+
+        self.urls = ()
+        self._task = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_errors = 0
+
+    def start(self, wait_for=None):
+        """Start the refill task, optionally after awaiting ``wait_for()`` first."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(wait_for))
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self):
+        return {
+            "query": self.query,
+            "size": len(self.urls),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refills": self.refills,
+            "refill_errors": self.refill_errors,
+        }
+
+    async def _run(self, wait_for=None):
+        if wait_for is not None:
+            await wait_for()
+
+        delay = await self.seed()
+        if delay:
+            await asyncio.sleep(delay)
+
+        while True:
+            try:
+                await self.refill()
+                delay = POOL_REFRESH_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except GiphyError as e:
+                self.refill_errors += 1
+                print(f"⚠️ GIF pool refill failed for {self.query!r}:", e)
+                delay = POOL_RETRY_SECONDS
+            except Exception as e:
+                # Anything else must not end the refill task for good
+                self.refill_errors += 1
+                print(f"⚠️ GIF pool refill error for {self.query!r}:", repr(e))
+                delay = POOL_RETRY_SECONDS
+
+            await asyncio.sleep(delay)
+
+    async def seed(self):
+        """Start from the URLs Giphy returned before the last restart.
+
+        Returns how long the first refill can wait: a pool saved less than
+        ``POOL_REFRESH_SECONDS`` ago is not re-fetched on boot.
+        """
+        if self.urls:
+            return 0
+
+        await self.giphy.start()  # loads the saved fallback file
+        urls = self.giphy.fallback_for(self.query, self.rating)
+        if not urls:
+            return 0
+
+        self.urls = urls
+        age = self.giphy.fallback_age(self.query, self.rating)
+        if age is None or len(urls) < self.size // 2:
+            return 0  # bundled or partial: refresh now, serve these meanwhile
+        return max(POOL_REFRESH_SECONDS - age, 0)
+
+    async def refill(self):
+        urls = []
+        seen = set()
+
+        for offset in range(0, self.size, POOL_PAGE_SIZE):
+            limit = min(POOL_PAGE_SIZE, self.size - offset)
+            page = await self.giphy.fetch(self.query, self.rating, limit, offset)
+
+            for url in page:
+                if url not in seen:
+                    seen.add(url)
+                    urls.append(url)
+
+            if len(page) < limit:
+                break  # ran out of results
+
+        # Keep the old pool if Giphy suddenly returns nothing
+        if urls:
+            self.urls = tuple(urls)
+            self.refills += 1
+
+    async def pick(self):
+        """Return a random URL, falling back to a live search if the pool is empty.
+
+        Returns ``None`` when Giphy has no results; raises ``GiphyError`` when
+        the pool is empty and the live search fails.
+        """
+        if self.urls:
+            self.hits += 1
+            return random.choice(self.urls)
+
+        self.misses += 1
+        self.start()
+
+        gifs = await self.giphy.search(self.query, rating=self.rating, limit=10)
+        return random.choice(gifs) if gifs else None
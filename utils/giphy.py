@@ -0,0 +1,349 @@
+import os
+import json
+import time
+import asyncio
+import aiohttp
+from collections import OrderedDict
+
+from utils.cache import TTLCache
+from utils.metrics import METRICS
+from utils.ratelimit import TokenBucket, CircuitBreaker
+
+GIPHY_API_KEY = os.getenv("GIPHY_API_KEY")
+GIPHY_URL = os.getenv("GIPHY_URL", "https://api.giphy.com/v1/gifs/search")
+
+# Search cache: results are fresh for CACHE_TTL seconds, then served stale
+# (while a background refresh runs) for up to CACHE_STALE_TTL more.
+CACHE_SIZE = int(os.getenv("GIPHY_CACHE_SIZE", "512"))
+CACHE_TTL = int(os.getenv("GIPHY_CACHE_TTL", "900"))
+CACHE_STALE_TTL = int(os.getenv("GIPHY_CACHE_STALE_TTL", "3600"))
+
+# Keys have an hourly quota (100/hour for beta keys); stay under it. Sharded
+# workers split it (see GiphyClient's ``share``) and the remaining budget is
+# saved with the fallback file, so restarts don't get a fresh allowance.
+RATE_LIMIT_PER_HOUR = int(os.getenv("GIPHY_RATE_LIMIT", "100"))
+RATE_BURST = int(os.getenv("GIPHY_RATE_BURST", "30"))
+
+# 429 opens the breaker at once; 5xx/timeouts after BREAKER_THRESHOLD in a row
+BREAKER_THRESHOLD = int(os.getenv("GIPHY_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = int(os.getenv("GIPHY_BREAKER_COOLDOWN", "30"))
+
+# URLs served while Giphy is unavailable: everything fetched recently (saved
+# to FALLBACK_PATH so it survives restarts) plus an optional bundled file,
+# generated with scripts/update_giphy_fallback.py and skipped if missing.
+# Both use {"entries": [{"query": ..., "rating": ..., "urls": [...]}]}.
+FALLBACK_PATH = os.getenv("GIPHY_FALLBACK", "data/giphy_fallback.json")
+FALLBACK_BUNDLED_PATH = os.getenv("GIPHY_FALLBACK_BUNDLED", "config/giphy_fallback.json")
+# As many as a full GIF pool, so pools can be seeded from the file on boot
+FALLBACK_URLS_PER_QUERY = int(os.getenv("GIF_POOL_SIZE", "300"))
+FALLBACK_SAVE_SECONDS = 600
+
+
+class GiphyError(Exception):
+    pass
+
+
+class GiphyUnavailable(GiphyError):
+    """Giphy wasn't called: the rate limit is used up or the circuit breaker is open."""
+
+
+def _retry_after(headers):
+    try:
+        return float(headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class GiphyClient:
+    """One pooled aiohttp session shared by every Giphy cog."""
+
+    def __init__(self, api_key=GIPHY_API_KEY, share=1.0, fallback_path=FALLBACK_PATH):
+        self.api_key = api_key
+        self.session = None
+        self._closed = False  # set by close(); stops fetch() from reopening
+        self.cache = TTLCache(CACHE_SIZE, CACHE_TTL, CACHE_STALE_TTL)
+
+        # key -> Task, so concurrent misses/refreshes share one request
+        self._inflight = {}
+
+        # ``share``: this process's fraction of the key's quota
+        self.bucket = TokenBucket(RATE_LIMIT_PER_HOUR * share / 3600, max(RATE_BURST * share, 1))
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+        # (query, rating) -> URLs, most recently used last; saved to
+        # ``fallback_path`` (None: nothing is read from or written to data/)
+        self.fallback = OrderedDict()
+        self.fallback_updated = {}  # (query, rating) -> wall-clock time fetched
+        self.fallback_path = fallback_path
+        self._loaded = False
+        self._dirty = False
+        self._saved = time.monotonic()
+        self._save_task = None
+
+    async def start(self):
+        self._closed = False
+
+        if not self._loaded:
+            self._loaded = True
+            loaded, updated, bucket = await asyncio.to_thread(self._read_fallback)
+
+            # Anything fetched while the file was being read is newer
+            for key, urls in loaded.items():
+                if key not in self.fallback:
+                    self.fallback[key] = urls
+                    if key in updated:
+                        self.fallback_updated[key] = updated[key]
+
+            if bucket:
+                self.bucket.restore(bucket["tokens"], time.time() - bucket["at"])
+
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=20,               # total pooled sockets
+            limit_per_host=10,      # everything goes to api.giphy.com
+            ttl_dns_cache=300,      # cache DNS for 5 minutes
+            keepalive_timeout=60    # keep idle sockets warm between commands
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10, sock_connect=5)
+        )
+
+    async def close(self):
+        self._closed = True
+
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+
+        if self._dirty and self.fallback_path:
+            await asyncio.to_thread(self._save_fallback, self._fallback_snapshot())
+            self._dirty = False
+
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def search(self, query, rating="", limit=10, offset=0):
+        """Return a tuple of original-size GIF URLs for a Giphy search.
+
+        Served from the cache when possible; a stale entry is returned
+        immediately and refreshed in the background. If Giphy fails, URLs
+        previously seen for the same query are returned instead.
+        """
+        key = (query.strip().lower(), rating, limit, offset)
+
+        urls, fresh = self.cache.get(key)
+        if urls is not None:
+            if not fresh:
+                self._refresh(key)
+            return urls
+
+        try:
+            # shield: one impatient caller must not cancel a fetch others await
+            return await asyncio.shield(self._refresh(key))
+        except GiphyError:
+            urls = self.fallback_for(query, rating)
+            if not urls:
+                raise
+            METRICS.inc("giphy_fallback_total")
+            return urls
+
+    def _refresh(self, key):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_into_cache(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Background revalidations nobody awaits: don't leave the error unread
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_into_cache(self, key):
+        urls = await self.fetch(*key)
+        self.cache.set(key, urls)
+        return urls
+
+    async def fetch(self, query, rating="", limit=10, offset=0):
+        """Uncached search; used for one-off pages such as pool refills.
+
+        Raises ``GiphyUnavailable`` without a network call while the breaker
+        is open or the hourly budget is spent.
+        """
+        if self.session is None or self.session.closed:
+            if self._closed:
+                raise GiphyUnavailable("Giphy client is closed")
+            await self.start()
+
+        if not self.breaker.allow():
+            METRICS.inc("giphy_rejected_total", reason="breaker")
+            raise GiphyUnavailable(f"Giphy paused for {self.breaker.retry_in():.0f}s")
+
+        if not self.bucket.try_acquire():
+            self.breaker.abandon()
+            METRICS.inc("giphy_rejected_total", reason="rate_limit")
+            raise GiphyUnavailable("Giphy rate limit reached")
+        self._dirty = True  # remaining budget changed
+
+        params = {
+            "api_key": self.api_key,
+            "q": query,
+            "limit": limit,
+            "offset": offset,
+            "rating": rating
+        }
+
+        try:
+            with METRICS.timer("http_request_seconds", service="giphy"):
+                async with self.session.get(GIPHY_URL, params=params) as resp:
+                    METRICS.inc("http_responses_total", service="giphy", status=resp.status)
+
+                    if resp.status == 429 or resp.status >= 500:
+                        self.breaker.record_failure(
+                            _retry_after(resp.headers), trip=resp.status == 429
+                        )
+                        raise GiphyError(f"Giphy returned HTTP {resp.status}")
+
+                    if resp.status != 200:
+                        # Giphy answered; a bad key or query isn't an outage
+                        self.breaker.record_success()
+                        raise GiphyError(f"Giphy returned HTTP {resp.status}")
+
+                    data = await resp.json()
+
+                    # Tuples: cached results are shared between callers
+                    urls = tuple(gif["images"]["original"]["url"] for gif in data.get("data", []))
+        except GiphyError:
+            raise
+        except aiohttp.ClientError as e:
+            self.breaker.record_failure()
+            METRICS.inc("http_errors_total", service="giphy")
+            raise GiphyError(str(e)) from e
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            METRICS.inc("http_errors_total", service="giphy")
+            raise GiphyError("Giphy request timed out") from e
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # HTTP 200 with a body that isn't the search JSON we expect
+            self.breaker.record_failure()
+            METRICS.inc("http_errors_total", service="giphy")
+            raise GiphyError(f"Giphy returned a malformed response ({type(e).__name__})") from e
+        except BaseException:
+            # Cancelled (or a bug): release the half-open probe so it isn't stuck
+            self.breaker.abandon()
+            raise
+
+        self.breaker.record_success()
+        self._remember(query, rating, urls)
+        return urls
+
+    # =========================================
+    # FALLBACK URLS
+    # =========================================
+    def fallback_for(self, query, rating=""):
+        key = (query.strip().lower(), rating)
+        urls = self.fallback.get(key, ())
+        if urls:
+            self.fallback.move_to_end(key)
+        return urls
+
+    def fallback_age(self, query, rating=""):
+        """Seconds since the fallback URLs for a query were fetched (None if never)."""
+        updated = self.fallback_updated.get((query.strip().lower(), rating))
+        return None if updated is None else max(time.time() - updated, 0.0)
+
+    def _remember(self, query, rating, urls):
+        if not urls:
+            return
+
+        key = (query.strip().lower(), rating)
+        merged = dict.fromkeys(self.fallback.get(key, ()))
+        merged.update(dict.fromkeys(urls))
+
+        self.fallback[key] = tuple(merged)[-FALLBACK_URLS_PER_QUERY:]
+        self.fallback_updated[key] = time.time()
+        self.fallback.move_to_end(key)
+        while len(self.fallback) > CACHE_SIZE:
+            old, _ = self.fallback.popitem(last=False)
+            self.fallback_updated.pop(old, None)
+
+        self._dirty = True
+        if not self.fallback_path:
+            return
+
+        if time.monotonic() - self._saved >= FALLBACK_SAVE_SECONDS:
+            if self._save_task is None or self._save_task.done():
+                self._saved = time.monotonic()
+                self._dirty = False
+                self._save_task = asyncio.ensure_future(
+                    asyncio.to_thread(self._save_fallback, self._fallback_snapshot())
+                )
+
+    def _fallback_snapshot(self):
+        return {
+            "version": 1,
+            "bucket": {"tokens": self.bucket.tokens_left(), "at": time.time()},
+            "entries": [
+                {
+                    "query": query,
+                    "rating": rating,
+                    "updated": self.fallback_updated.get((query, rating)),
+                    "urls": list(urls)
+                }
+                for (query, rating), urls in self.fallback.items()
+            ]
+        }
+
+    def _read_fallback(self):
+        # Bundled first, so URLs saved from real traffic take precedence
+        loaded = {}
+        updated = {}
+        bucket = None
+
+        paths = [FALLBACK_BUNDLED_PATH]
+        if self.fallback_path:
+            paths.append(self.fallback_path)
+
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring GIF fallback file {path}:", e)
+                continue
+
+            for entry in data.get("entries", []):
+                key = (entry["query"].strip().lower(), entry.get("rating", ""))
+                urls = tuple(entry.get("urls", ()))[-FALLBACK_URLS_PER_QUERY:]
+                if urls:
+                    loaded[key] = urls
+                    if entry.get("updated"):
+                        updated[key] = entry["updated"]
+
+            if path == self.fallback_path:
+                bucket = data.get("bucket")
+
+        return loaded, updated, bucket
+
+    def _save_fallback(self, snapshot):
+        try:
+            directory = os.path.dirname(self.fallback_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp = self.fallback_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.fallback_path)
+        except OSError as e:
+            print("⚠️ Couldn't save GIF fallback file:", e)
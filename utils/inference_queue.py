@@ -0,0 +1,146 @@
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+
+
+class QueueFull(Exception):
+    pass
+
+
+class UserQueueFull(QueueFull):
+    pass
+
+
+class InferenceScheduler:
+    """Concurrency limiter with a bounded, per-user fair FIFO.
+
+    At most ``concurrency`` generations run at once. Waiters are served
+    round-robin across users (each user's own requests stay FIFO), so one
+    person spamming /ask can't starve everyone else. When ``max_queue``
+    requests are already waiting, new ones fail fast with ``QueueFull``.
+    """
+
+    def __init__(self, concurrency=1, max_queue=8, max_per_user=2):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+        # user_id -> deque of [future, on_position, last_reported_position];
+        # dict order is the round-robin order
+        self._queues = OrderedDict()
+
+    def position(self, user_id, future):
+        """1-based place of ``future`` in the order waiters will be served."""
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return 0
+
+        rank = next((i for i, entry in enumerate(queue) if entry[0] is future), None)
+        if rank is None:
+            return 0
+
+        ahead = 0
+        before = True
+        for uid, q in self._queues.items():
+            if uid == user_id:
+                before = False
+                continue
+            ahead += min(len(q), rank + 1 if before else rank)
+
+        return ahead + rank + 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, user_id, on_position=None):
+        await self.acquire(user_id, on_position)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, user_id, on_position=None):
+        """Wait for a free generation slot.
+
+        ``on_position`` is an optional coroutine function called with the
+        current queue position whenever it changes.
+        """
+        if self.active < self.concurrency and not self.waiting:
+            self.active += 1
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise QueueFull(f"{self.waiting} requests already waiting")
+
+        queue = self._queues.setdefault(user_id, deque())
+        if len(queue) >= self.max_per_user:
+            self.rejected += 1
+            raise UserQueueFull(f"{len(queue)} requests already waiting for this user")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append([future, on_position, 0])
+        self.waiting += 1
+        self._notify_positions()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just as we got cancelled: give it back
+                self.release()
+            else:
+                self._remove(user_id, future)
+                self._notify_positions()
+            raise
+
+    def release(self):
+        self.active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.active < self.concurrency and self._queues:
+            user_id, queue = next(iter(self._queues.items()))
+            future = queue.popleft()[0]
+            self.waiting -= 1
+
+            # Rotate: this user goes to the back of the round-robin
+            del self._queues[user_id]
+            if queue:
+                self._queues[user_id] = queue
+
+            if future.done():
+                continue
+
+            self.active += 1
+            future.set_result(None)
+
+        self._notify_positions()
+
+    def _remove(self, user_id, future):
+        queue = self._queues.get(user_id)
+        if not queue:
+            return
+
+        for entry in queue:
+            if entry[0] is future:
+                queue.remove(entry)
+                self.waiting -= 1
+                break
+
+        if not queue:
+            del self._queues[user_id]
+
+    def _notify_positions(self):
+        for user_id, queue in self._queues.items():
+            for entry in queue:
+                future, on_position, last = entry
+                if on_position is None:
+                    continue
+
+                pos = self.position(user_id, future)
+                if pos != last:
+                    entry[2] = pos
+                    asyncio.ensure_future(on_position(pos))
@@ -0,0 +1,188 @@
+import os
+import time
+import asyncio
+import contextlib
+from collections import deque
+
+import discord
+from discord import app_commands
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # 0 disables the endpoint
+
+LOOP_LAG_INTERVAL = 0.5
+RESERVOIR_SIZE = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Summary:
+    """Count, sum and a sliding window of recent samples for quantiles."""
+
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class Metrics:
+    """Process-wide counters and latency summaries, keyed by name + labels."""
+
+    def __init__(self):
+        self.counters = {}
+        self.summaries = {}
+        self.started = time.time()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        summary = self.summaries.get(key)
+        if summary is None:
+            summary = self.summaries[key] = Summary()
+        summary.observe(value)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def summary(self, name, **labels):
+        return self.summaries.get(self._key(name, labels))
+
+    def series(self, name):
+        """``[(labels dict, Summary), ...]`` for every label set of ``name``."""
+        return [
+            (dict(labels), summary)
+            for (n, labels), summary in self.summaries.items() if n == name
+        ]
+
+    def counter_series(self, name):
+        return [(dict(labels), value) for (n, labels), value in self.counters.items() if n == name]
+
+    # =========================================
+    # PROMETHEUS TEXT FORMAT
+    # =========================================
+    @staticmethod
+    def _labels(labels, **extra):
+        items = list(labels) + sorted(extra.items())
+        if not items:
+            return ""
+        body = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+        return "{" + body + "}"
+
+    def render_prometheus(self):
+        lines = []
+
+        for name in sorted({n for n, _ in self.counters}):
+            lines.append(f"# TYPE zee_{name} counter")
+            for (n, labels), value in sorted(self.counters.items()):
+                if n == name:
+                    lines.append(f"zee_{name}{self._labels(labels)} {value}")
+
+        for name in sorted({n for n, _ in self.summaries}):
+            lines.append(f"# TYPE zee_{name} summary")
+            for (n, labels), summary in sorted(self.summaries.items()):
+                if n != name:
+                    continue
+                for q, value in summary.quantiles().items():
+                    lines.append(f"zee_{name}{self._labels(labels, quantile=q)} {value:.6f}")
+                lines.append(f"zee_{name}_sum{self._labels(labels)} {summary.total:.6f}")
+                lines.append(f"zee_{name}_count{self._labels(labels)} {summary.count}")
+
+        lines.append("# TYPE zee_uptime_seconds gauge")
+        lines.append(f"zee_uptime_seconds {time.time() - self.started:.0f}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Command tree that records per-command latency and error counts."""
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        interaction.extras["metrics_started"] = time.perf_counter()
+
+        # Time between Discord creating the interaction and us seeing it
+        delay = discord.utils.utcnow() - interaction.created_at
+        METRICS.observe("interaction_delivery_seconds", max(delay.total_seconds(), 0.0))
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        command = interaction.command.qualified_name if interaction.command else "unknown"
+        METRICS.inc("command_errors_total", command=command, error=type(error).__name__)
+        record_command(interaction, command, ok=False)
+        await super().on_error(interaction, error)
+
+
+def record_command(interaction, command, ok=True):
+    started = interaction.extras.pop("metrics_started", None)
+    if started is not None:
+        METRICS.observe("command_latency_seconds", time.perf_counter() - started, command=command)
+    METRICS.inc("commands_total", command=command, status="ok" if ok else "error")
+
+
+async def monitor_loop_lag():
+    """Sample how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        METRICS.observe("event_loop_lag_seconds", max(loop.time() - start - LOOP_LAG_INTERVAL, 0.0))
+
+
+class MetricsServer:
+    """Serves ``/metrics`` in Prometheus text format on a local port."""
+
+    def __init__(self, host=METRICS_HOST, port=METRICS_PORT):
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        # Imported here: aiohttp.web costs ~40 ms and METRICS_PORT=0 never needs it
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request):
+        from aiohttp import web
+
+        return web.Response(text=METRICS.render_prometheus(), content_type="text/plain", charset="utf-8")
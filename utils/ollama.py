@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import asyncio
+import aiohttp
+
+from utils.metrics import METRICS
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
+
+# Connecting to a local Ollama should be instant; generating can take minutes.
+CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "300"))
+
+
+class OllamaError(Exception):
+    pass
+
+
+class OllamaTimeout(OllamaError):
+    pass
+
+
+class OllamaClient:
+    """Async Ollama HTTP client with a persistent pooled session.
+
+    Every request runs as a tracked task so ``close`` (or ``cancel_all``)
+    can abort generations that are still in flight.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout
+        )
+        self.session = None
+        self._tasks = set()
+
+    async def start(self):
+        if self.session is not None and not self.session.closed:
+            return
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=120),
+            timeout=self.timeout
+        )
+
+    async def close(self):
+        self.cancel_all()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def generate(self, payload):
+        """POST /api/generate with ``stream: false`` and return the JSON body."""
+        return await self._tracked(self._post("/api/generate", dict(payload, stream=False)))
+
+    async def preload(self, model, keep_alive):
+        """Load ``model`` into memory (or extend its stay) without generating."""
+        return await self._tracked(self._post("/api/generate", {
+            "model": model,
+            "keep_alive": keep_alive,
+            "stream": False
+        }))
+
+    async def loaded_models(self):
+        """Names of the models currently held in memory (/api/ps)."""
+        data = await self._tracked(self._get("/api/ps"))
+        return [m.get("name") or m.get("model") for m in data.get("models", [])]
+
+    async def stream(self, payload):
+        """POST /api/generate with ``stream: true`` and yield each NDJSON chunk."""
+        if self.session is None or self.session.closed:
+            await self.start()
+
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        started = time.perf_counter()
+        first_chunk = True
+        try:
+            async with self.session.post(
+                self.base_url + "/api/generate",
+                json=dict(payload, stream=True)
+            ) as resp:
+                METRICS.inc("http_responses_total", service="ollama", status=resp.status)
+                if resp.status != 200:
+                    raise OllamaError(f"Ollama returned HTTP {resp.status}: {await resp.text()}")
+
+                async for line in resp.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise OllamaError(chunk["error"])
+
+                    if first_chunk:
+                        first_chunk = False
+                        METRICS.observe(
+                            "ollama_first_token_seconds", time.perf_counter() - started
+                        )
+
+                    yield chunk
+                    if chunk.get("done"):
+                        return
+        except asyncio.TimeoutError as e:
+            METRICS.inc("http_errors_total", service="ollama")
+            raise OllamaTimeout("Ollama request timed out") from e
+        except aiohttp.ClientError as e:
+            METRICS.inc("http_errors_total", service="ollama")
+            raise OllamaError(str(e)) from e
+        finally:
+            METRICS.observe(
+                "http_request_seconds", time.perf_counter() - started, service="ollama_stream"
+            )
+            self._tasks.discard(task)
+
+    async def _tracked(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        try:
+            return await task
+        finally:
+            self._tasks.discard(task)
+
+    async def _get(self, path):
+        return await self._request("GET", path)
+
+    async def _post(self, path, payload):
+        return await self._request("POST", path, payload)
+
+    async def _request(self, method, path, payload=None):
+        if self.session is None or self.session.closed:
+            await self.start()
+
+        try:
+            with METRICS.timer("http_request_seconds", service="ollama"):
+                async with self.session.request(method, self.base_url + path, json=payload) as resp:
+                    METRICS.inc("http_responses_total", service="ollama", status=resp.status)
+                    if resp.status != 200:
+                        raise OllamaError(f"Ollama returned HTTP {resp.status}: {await resp.text()}")
+                    return await resp.json()
+        except asyncio.TimeoutError as e:
+            METRICS.inc("http_errors_total", service="ollama")
+            raise OllamaTimeout("Ollama request timed out") from e
+        except aiohttp.ClientError as e:
+            METRICS.inc("http_errors_total", service="ollama")
+            raise OllamaError(str(e)) from e
@@ -0,0 +1,112 @@
+import time
+
+
+class TokenBucket:
+    """Allows ``rate`` operations per second on average, in bursts of up to ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _fill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if available; never waits."""
+        self._fill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def available(self):
+        self._fill()
+        return int(self.tokens)
+
+    def tokens_left(self):
+        self._fill()
+        return self.tokens
+
+    def restore(self, tokens, elapsed):
+        """Resume from a saved level, ``elapsed`` seconds ago (e.g. before a restart)."""
+        self.tokens = min(self.capacity, max(tokens, 0.0) + max(elapsed, 0.0) * self.rate)
+        self.updated = time.monotonic()
+
+
+class CircuitBreaker:
+    """Stops calls to an upstream that is failing or rejecting us.
+
+    ``closed``: calls go through; ``threshold`` consecutive failures open it.
+    ``open``: calls are refused until the cool-down ends.
+    ``half_open``: a single probe call is let through; success closes the
+    breaker, failure re-opens it with a doubled cool-down (up to ``max_cooldown``).
+    """
+
+    def __init__(self, threshold=3, cooldown=30, max_cooldown=900):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_until = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def allow(self):
+        if self.state == "closed":
+            return True
+
+        if self.state == "open":
+            if time.monotonic() < self.opened_until:
+                return False
+            self.state = "half_open"
+            self.probing = False
+
+        # half_open: one probe at a time
+        if self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.probing = False
+
+    def record_failure(self, retry_after=None, trip=False):
+        """Count a failure; ``trip`` (e.g. HTTP 429) opens the breaker immediately."""
+        self.failures += 1
+
+        if self.state == "half_open":
+            # The probe failed: back off harder
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        elif not trip and self.failures < self.threshold:
+            return
+
+        self.open(retry_after)
+
+    def abandon(self):
+        """The probe was cancelled before it got an answer; let another one through."""
+        self.probing = False
+
+    def open(self, retry_after=None):
+        if self.state != "open":
+            self.trips += 1
+
+        delay = self.cooldown if retry_after is None else max(retry_after, self.cooldown)
+        self.state = "open"
+        self.probing = False
+        self.opened_until = time.monotonic() + min(delay, self.max_cooldown)
+
+    def retry_in(self):
+        """Seconds until the breaker lets a probe through (0 when not open)."""
+        if self.state != "open":
+            return 0.0
+        return max(self.opened_until - time.monotonic(), 0.0)
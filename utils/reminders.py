@@ -0,0 +1,229 @@
+import os
+import time
+import heapq
+import asyncio
+from collections import defaultdict
+
+from utils.sqlite_store import SQLiteStore
+
+REMINDER_DB_PATH = os.getenv("ZEE_REMINDER_DB", "data/reminders.sqlite3")
+
+# Reminders more than this late (e.g. after downtime) are skipped, not sent
+LATE_GRACE_SECONDS = 120
+# Upper bound on one sleep, so wall-clock jumps are noticed
+MAX_SLEEP_SECONDS = 600
+# A group whose next event can't be resolved (e.g. its cog is reloading)
+# is retried this often instead of being dropped
+RESOLVE_RETRY_SECONDS = 300
+SEND_CONCURRENCY = 5
+
+
+class ReminderStore(SQLiteStore):
+    """SQLite persistence for reminder subscriptions (worker-thread access)."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS subscriptions ("
+        " guild_id INTEGER NOT NULL,"
+        " channel_id INTEGER NOT NULL,"
+        " user_id INTEGER NOT NULL,"   # 0 = whole channel
+        " target TEXT NOT NULL,"
+        " lead INTEGER NOT NULL,"
+        " PRIMARY KEY (channel_id, user_id, target, lead))",
+    )
+
+    def __init__(self, path=REMINDER_DB_PATH):
+        super().__init__(path)
+
+    async def load(self):
+        return await self.query("SELECT guild_id, channel_id, user_id, target, lead FROM subscriptions")
+
+    async def add(self, guild_id, channel_id, user_id, target, lead):
+        await self.execute(
+            "INSERT OR IGNORE INTO subscriptions (guild_id, channel_id, user_id, target, lead)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (guild_id, channel_id, user_id, target, lead)
+        )
+
+    async def remove(self, channel_id, user_id, target, lead):
+        await self.execute(
+            "DELETE FROM subscriptions WHERE channel_id = ? AND user_id = ? AND target = ? AND lead = ?",
+            (channel_id, user_id, target, lead)
+        )
+
+    async def remove_channel(self, channel_id):
+        await self.execute("DELETE FROM subscriptions WHERE channel_id = ?", (channel_id,))
+
+
+class ReminderEngine:
+    """One async scheduler for every reminder subscription.
+
+    Subscriptions sharing a ``(target, lead)`` pair form a group with a single
+    heap entry, so the heap stays as small as the number of distinct
+    reminder kinds no matter how many users subscribe; each subscription is
+    just a user id in a per-channel set. When a group fires, everything due
+    for a channel is handed to ``deliver`` in one batch.
+
+    ``resolve(target, after_ts)`` returns the POSIX time of the next event for
+    ``target`` strictly after ``after_ts`` (or None).
+    ``deliver(channel_id, items)`` is a coroutine receiving
+    ``[(target, event_ts, user_ids), ...]``.
+    """
+
+    def __init__(self, resolve, deliver):
+        self.resolve = resolve
+        self.deliver = deliver
+
+        # (target, lead) -> {channel_id: set(user_id)}
+        self.groups = {}
+        self._heap = []          # (fire_ts, event_ts, target, lead); event_ts 0 = retry resolve
+        self._scheduled = set()  # groups that currently have a heap entry
+        self._unresolved = set()  # groups waiting for a resolve retry
+
+        self._wake = asyncio.Event()
+        self._task = None
+
+        self.sent = 0
+        self.skipped_late = 0
+
+    def __len__(self):
+        return sum(len(users) for channels in self.groups.values() for users in channels.values())
+
+    def start(self):
+        """Start firing; groups added before this are scheduled now."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+            now = time.time()
+            for target, lead in list(self.groups):
+                self._schedule((target, lead), now + lead * 60)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def add(self, channel_id, user_id, target, lead):
+        channels = self.groups.setdefault((target, lead), {})
+        users = channels.setdefault(channel_id, set())
+        if user_id in users:
+            return False
+
+        users.add(user_id)
+        if self._task is not None:
+            self._schedule((target, lead), time.time() + lead * 60)
+        return True
+
+    def remove(self, channel_id, user_id, target, lead):
+        key = (target, lead)
+        channels = self.groups.get(key)
+        users = channels.get(channel_id) if channels else None
+        if not users or user_id not in users:
+            return False
+
+        users.discard(user_id)
+        if not users:
+            del channels[channel_id]
+        if not channels:
+            # Its heap entry is dropped lazily when it comes due
+            del self.groups[key]
+        return True
+
+    def remove_channel(self, channel_id):
+        for key in list(self.groups):
+            channels = self.groups[key]
+            channels.pop(channel_id, None)
+            if not channels:
+                del self.groups[key]
+
+    def subscriptions(self, channel_id, user_id):
+        return sorted(
+            (target, lead) for (target, lead), channels in self.groups.items()
+            if user_id in channels.get(channel_id, ())
+        )
+
+    def _schedule(self, key, after_ts):
+        if key in self._scheduled:
+            return
+
+        target, lead = key
+        try:
+            event_ts = self.resolve(target, after_ts)
+        except Exception as e:
+            print(f"Resolving reminder {target!r} failed:", e)
+            event_ts = None
+
+        if event_ts is None:
+            if key not in self._unresolved:
+                print(f"⚠️ No upcoming event for reminder {target!r}, retrying every {RESOLVE_RETRY_SECONDS}s")
+                self._unresolved.add(key)
+            heapq.heappush(self._heap, (time.time() + RESOLVE_RETRY_SECONDS, 0, target, lead))
+        else:
+            if key in self._unresolved:
+                print(f"✅ Reminder {target!r} is scheduled again")
+                self._unresolved.discard(key)
+            heapq.heappush(self._heap, (event_ts - lead * 60, event_ts, target, lead))
+
+        self._scheduled.add(key)
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=min(delay, MAX_SLEEP_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batches = self._pop_due(time.time())
+            if batches:
+                await self._deliver_all(batches)
+
+    def _pop_due(self, now):
+        batches = defaultdict(list)
+
+        while self._heap and self._heap[0][0] <= now:
+            fire_ts, event_ts, target, lead = heapq.heappop(self._heap)
+            key = (target, lead)
+            self._scheduled.discard(key)
+
+            channels = self.groups.get(key)
+            if not channels:
+                self._unresolved.discard(key)
+                continue
+
+            if not event_ts:
+                # Retry entry: nothing to send, just try resolving again
+                self._schedule(key, now + lead * 60)
+                continue
+
+            if now - fire_ts <= LATE_GRACE_SECONDS:
+                for channel_id, users in channels.items():
+                    batches[channel_id].append((target, event_ts, tuple(users)))
+            else:
+                self.skipped_late += 1
+
+            # Next event of this kind; also re-arms after downtime
+            self._schedule(key, max(event_ts, now + lead * 60))
+
+        return batches
+
+    async def _deliver_all(self, batches):
+        semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+        async def send(channel_id, items):
+            async with semaphore:
+                try:
+                    await self.deliver(channel_id, items)
+                    self.sent += 1
+                except Exception as e:
+                    print(f"Reminder delivery to {channel_id} failed:", e)
+
+        await asyncio.gather(*(send(cid, items) for cid, items in batches.items()))
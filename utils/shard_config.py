@@ -0,0 +1,62 @@
+import os
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+
+SHARD_CONFIG_PATH = os.getenv("SHARD_CONFIG", "config/shard.json")
+SHARD_CONFIG_VERSION = 1
+
+
+def _duration(text):
+    hours, minutes, seconds = (int(part) for part in text.split(":"))
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+@dataclass(frozen=True)
+class ShardConfig:
+    """Immutable shard calculator settings loaded from a versioned JSON file.
+
+    Every process and restart that loads the same file computes the same
+    schedule.
+    """
+
+    version: int
+    tz: ZoneInfo
+    anchor_date: date          # a confirmed BLACK shard day
+    global_time_adjust: timedelta
+    land_offset: timedelta
+    end_offset: timedelta
+    black_interval: timedelta
+    red_interval: timedelta
+    realms: tuple
+    offsets: tuple             # same order as the original system
+
+
+def load_shard_config(path=SHARD_CONFIG_PATH):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    version = data.get("version")
+    if version != SHARD_CONFIG_VERSION:
+        raise ValueError(
+            f"{path}: unsupported shard config version {version!r} "
+            f"(expected {SHARD_CONFIG_VERSION})"
+        )
+
+    offsets = tuple(_duration(o) for o in data["offsets"])
+    if len(offsets) != 5:
+        raise ValueError(f"{path}: expected 5 offsets (2 black + 3 red groups), got {len(offsets)}")
+
+    return ShardConfig(
+        version=version,
+        tz=ZoneInfo(data["timezone"]),
+        anchor_date=date.fromisoformat(data["anchor_date"]),
+        global_time_adjust=_duration(data["global_time_adjust"]),
+        land_offset=_duration(data["land_offset"]),
+        end_offset=_duration(data["end_offset"]),
+        black_interval=_duration(data["black_interval"]),
+        red_interval=_duration(data["red_interval"]),
+        realms=tuple(data["realms"]),
+        offsets=offsets
+    )
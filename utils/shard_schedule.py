@@ -0,0 +1,273 @@
+import time
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+OCCURRENCES = 3
+
+# One row of a range query; starts/ends are POSIX timestamps
+ShardDay = namedtuple("ShardDay", "date is_red realm starts ends")
+
+
+def _seconds(delta):
+    return int(delta.total_seconds())
+
+
+class ShardTable:
+    """Array-backed shard days for a window starting at one LA midnight.
+
+    Day ``i`` occupies ``day_start[i]``; its occurrences are
+    ``occ_start/occ_end[i * 3 + k]``. ``next_any/next_red/next_black[i]``
+    hold the first day ``>= i`` of that colour (or -1), so "next red shard"
+    is a single index lookup.
+    """
+
+    __slots__ = (
+        "first_day", "day_start", "is_red", "realm", "occ_start", "occ_end",
+        "next_any", "next_red", "next_black"
+    )
+
+    def __init__(self, first_day, rows):
+        self.first_day = first_day
+        self.day_start = array("d")
+        self.is_red = array("b")
+        self.realm = array("b")
+        self.occ_start = array("d")
+        self.occ_end = array("d")
+
+        for _, midnight, red, realm, starts, ends in rows:
+            self.day_start.append(midnight)
+            self.is_red.append(red)
+            self.realm.append(realm)
+            self.occ_start.extend(starts)
+            self.occ_end.extend(ends)
+
+        n = len(self.day_start)
+        self.next_any = array("l", range(n))
+        self.next_red = array("l", [-1]) * n
+        self.next_black = array("l", [-1]) * n
+
+        red_idx = black_idx = -1
+        for i in range(n - 1, -1, -1):
+            if self.is_red[i]:
+                red_idx = i
+            else:
+                black_idx = i
+            self.next_red[i] = red_idx
+            self.next_black[i] = black_idx
+
+    def __len__(self):
+        return len(self.day_start)
+
+    def day_index(self, ts):
+        """Index of the day containing ``ts``, or -1 if outside the table."""
+        i = bisect_right(self.day_start, ts) - 1
+        # The last row has no following midnight to bound it
+        if i < 0 or i >= len(self.day_start) - 1:
+            return -1
+        return i
+
+    def next_index(self, ts, color=None, lookahead=15):
+        i = self.day_index(ts)
+        if i < 0:
+            return None
+
+        # Today only counts while its last occurrence hasn't ended
+        start = i + 1 if ts >= self.occ_end[i * OCCURRENCES + OCCURRENCES - 1] else i
+
+        if start >= len(self.day_start):
+            return None
+
+        if color == "red":
+            j = self.next_red[start]
+        elif color == "black":
+            j = self.next_black[start]
+        else:
+            j = self.next_any[start]
+
+        if j < 0 or j - i >= lookahead:
+            return None
+        return j
+
+
+class ShardSchedule:
+    """Precomputed shard calendar with O(1) "next shard" lookups.
+
+    A ``ShardTable`` covering ``window_days`` from today is built once and
+    rebuilt lazily when LA midnight rolls over.
+    """
+
+    def __init__(
+        self, tz, anchor, offsets, realms, global_time_adjust, end_offset,
+        black_interval, red_interval, window_days=62, lookahead_days=15
+    ):
+        self.tz = tz
+        self.anchor = anchor.date() if isinstance(anchor, datetime) else anchor
+        self.offsets = tuple(_seconds(o) for o in offsets)
+        self.realms = tuple(realms)
+        self.global_time_adjust = _seconds(global_time_adjust)
+        self.end_offset = _seconds(end_offset)
+        self.black_interval = _seconds(black_interval)
+        self.red_interval = _seconds(red_interval)
+        self.window_days = max(window_days, lookahead_days + 1)
+        self.lookahead_days = lookahead_days
+
+        self._table = None
+        self._expires = 0.0
+        self._rows = {}  # day index -> materialised row of the current table
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        return cls(
+            tz=config.tz,
+            anchor=config.anchor_date,
+            offsets=config.offsets,
+            realms=config.realms,
+            global_time_adjust=config.global_time_adjust,
+            end_offset=config.end_offset,
+            black_interval=config.black_interval,
+            red_interval=config.red_interval,
+            **kwargs
+        )
+
+    # =========================================
+    # DAY GENERATOR
+    # =========================================
+    def iter_days(self, first_day, days):
+        """Yield ``(date, midnight_ts, is_red, realm_index, starts, ends)`` per day.
+
+        Occurrence times are wall-clock offsets from LA midnight; the UTC
+        offset is only resolved per occurrence on the few days where it
+        changes (DST), so the common case is pure integer arithmetic.
+        """
+        tz = self.tz
+        one_day = timedelta(days=1)
+        day = first_day
+
+        midnight_dt = datetime(day.year, day.month, day.day, tzinfo=tz)
+        midnight = midnight_dt.timestamp()
+        offset = midnight_dt.utcoffset()
+
+        for _ in range(days):
+            next_day = day + one_day
+            next_dt = datetime(next_day.year, next_day.month, next_day.day, tzinfo=tz)
+            next_offset = next_dt.utcoffset()
+
+            cycle_day = (day - self.anchor).days
+
+            # Alternate daily
+            is_red = (cycle_day % 2) == 1
+
+            # Correct 2-group / 3-group rotation
+            half_cycle = cycle_day // 2
+            group_index = 2 + (half_cycle % 3) if is_red else half_cycle % 2
+
+            interval = self.red_interval if is_red else self.black_interval
+            first = self.offsets[group_index] + self.global_time_adjust
+            walls = [first + interval * i for i in range(OCCURRENCES)]
+
+            if offset == next_offset:
+                starts = [midnight + w for w in walls]
+                ends = [s + self.end_offset for s in starts]
+            else:
+                base = midnight_dt.replace(tzinfo=None)
+                starts = [self._wall_ts(base, w) for w in walls]
+                ends = [self._wall_ts(base, w + self.end_offset) for w in walls]
+
+            yield day, midnight, is_red, cycle_day % len(self.realms), starts, ends
+
+            day, midnight_dt, offset = next_day, next_dt, next_offset
+            midnight = next_dt.timestamp()
+
+    def _wall_ts(self, base, seconds):
+        return (base + timedelta(seconds=seconds)).replace(tzinfo=self.tz).timestamp()
+
+    # =========================================
+    # TABLE
+    # =========================================
+    def build(self, first_day):
+        return ShardTable(first_day, self.iter_days(first_day, self.window_days))
+
+    def table(self, now_ts=None):
+        """The table for today, rebuilt at the LA midnight rollover."""
+        if now_ts is None:
+            now_ts = time.time()
+
+        if self._table is None or now_ts >= self._expires or now_ts < self._table.day_start[0]:
+            today = datetime.fromtimestamp(now_ts, self.tz).date()
+            self._table = self.build(today)
+            self._expires = self._table.day_start[1]
+            self._rows = {}
+
+        return self._table
+
+    def row(self, table, i, now):
+        cached = self._rows.get(i) if table is self._table else None
+
+        if cached is None:
+            k = i * OCCURRENCES
+            tz = self.tz
+            cached = {
+                "isRed": bool(table.is_red[i]),
+                "realm": self.realms[table.realm[i]],
+                "occurrences": [
+                    (datetime.fromtimestamp(table.occ_start[k + n], tz),
+                     datetime.fromtimestamp(table.occ_end[k + n], tz))
+                    for n in range(OCCURRENCES)
+                ],
+            }
+            if table is self._table:
+                self._rows[i] = cached
+
+        return dict(cached, now=now)
+
+    def range(self, current_time, days, filter_color=None):
+        """Every shard day from ``current_time`` over the next ``days`` days.
+
+        Today is included until its last occurrence ends. Served from the
+        current table when it covers the window, otherwise generated in one
+        pass with ``iter_days``.
+        """
+        ts = current_time.timestamp()
+        table = self.table()
+        i = table.day_index(ts)
+
+        if i >= 0 and i + days < len(table):
+            rows = (
+                (table.first_day + timedelta(days=j), None, table.is_red[j], table.realm[j],
+                 table.occ_start[j * OCCURRENCES:(j + 1) * OCCURRENCES],
+                 table.occ_end[j * OCCURRENCES:(j + 1) * OCCURRENCES])
+                for j in range(i, i + days)
+            )
+        else:
+            rows = self.iter_days(current_time.astimezone(self.tz).date(), days)
+
+        result = []
+        for day, _, red, realm, starts, ends in rows:
+            if ends[-1] <= ts:
+                continue
+            if filter_color == "red" and not red:
+                continue
+            if filter_color == "black" and red:
+                continue
+            result.append(ShardDay(day, bool(red), self.realms[realm], tuple(starts), tuple(ends)))
+
+        return result
+
+    def find(self, current_time, filter_color=None):
+        """Next shard (optionally of one colour) at ``current_time``, or None."""
+        now = current_time.astimezone(self.tz)
+        ts = now.timestamp()
+
+        table = self.table()
+        i = table.day_index(ts)
+        if i < 0 or i + self.lookahead_days >= len(table):
+            # Outside today's window (e.g. a far-future query): one-off table
+            table = self.build(now.date())
+
+        i = table.next_index(ts, filter_color, self.lookahead_days)
+        if i is None:
+            return None
+
+        return self.row(table, i, now)
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import asyncio
+import threading
+
+
+class SQLiteStore:
+    """One SQLite file used from worker threads: a single WAL connection behind a lock.
+
+    Subclasses set ``SCHEMA`` (statements run when the file is opened) and
+    build their async API on ``query`` and ``execute``. The database is
+    opened on first use if ``open`` wasn't awaited.
+    """
+
+    SCHEMA = ()
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+    async def open(self):
+        await asyncio.to_thread(self._open)
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+    async def query(self, sql, params=()):
+        return await asyncio.to_thread(self._query, sql, params)
+
+    async def execute(self, sql, params=()):
+        await asyncio.to_thread(self._execute, sql, params)
+
+    def _open(self):
+        with self._lock:
+            if self._db is not None:
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+            self._db.commit()
+
+    def _close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _query(self, sql, params=()):
+        self._open()  # no-op once open
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _execute(self, sql, params=()):
+        self._open()
+        with self._lock:
+            self._db.execute(sql, params)
+            self._db.commit()